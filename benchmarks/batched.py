@@ -0,0 +1,86 @@
+"""
+Many small lasso problems: lockstep kernel vs a Python loop.
+
+    python benchmarks/batched.py [K]
+
+K replicates of the LassoNeighborhood graph (p=8) and K random problems
+per size p are solved once with batched_lasso_gram / batched_neighborhood_
+selection and once problem by problem. The script reports wall times and
+the largest coefficient difference between the two.
+
+With K=10000 on one core, over two runs, the batched kernel measured
+26-27x (p=8 neighborhoods), 17-29x (p=10), 15-21x (p=20) and 10-12x
+(p=50) over the loop. The gain shrinks with p: these random problems keep most coordinates active,
+and each move still updates a full gradient row per live problem.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from neighborhood import (
+    NEIGHBORHOOD_EDGES,
+    batched_lasso_gram,
+    batched_neighborhood_selection,
+    empirical_covariance,
+    lambda_max,
+    lasso_gram,
+    neighborhood_selection,
+    precision_from_edges,
+    sample_gaussian,
+)
+
+
+def timed(solve):
+    start = time.perf_counter()
+    result = solve()
+    return result, time.perf_counter() - start
+
+
+def random_problems(K, p, n=60, seed=0):
+    """
+    K Gram matrices X^T X / n with correlated columns, and targets c.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((K, n, p))
+    X[:, :, 1:] += 0.5 * X[:, :, :-1]
+    G = np.einsum("kni,knj->kij", X, X) / n
+    c = np.einsum("kni,kn->ki", X, X @ rng.standard_normal(p)) / n
+    return G, c
+
+
+def report(name, batched, looped):
+    (found, t_batch), (reference, t_loop) = batched, looped
+    print(f"{name:<28} {t_batch:>10.2f} {t_loop:>10.2f} {t_loop / t_batch:>8.1f}x"
+          f" {np.abs(found - reference).max():>10.1e}")
+
+
+def main(K):
+    print(f"{'problèmes':<28} {'lot (s)':>10} {'boucle (s)':>10} {'gain':>9} {'écart max':>10}")
+
+    # Répliques Monte Carlo du graphe de LassoNeighborhood
+    omega = precision_from_edges(8, NEIGHBORHOOD_EDGES)
+    S = np.array([empirical_covariance(sample_gaussian(omega, n=200, seed=k)) for k in range(K // 8)])
+    lam = 0.3 * lambda_max(S[0])
+    report(
+        f"{K // 8} voisinages p=8",
+        timed(lambda: batched_neighborhood_selection(S, lam)),
+        timed(lambda: np.array([neighborhood_selection(s, lam) for s in S])),
+    )
+
+    for p in (10, 20, 50):
+        G, c = random_problems(K, p)
+        lam = 0.2 * np.abs(c).max(axis=1)
+        report(
+            f"{K} lasso p={p}",
+            timed(lambda: batched_lasso_gram(G, c, lam)),
+            timed(lambda: np.array([lasso_gram(G[k], c[k], lam[k]) for k in range(K)])),
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 10000)
@@ -0,0 +1,104 @@
+"""
+float64 vs float32 neighborhood selection on our test graphs.
+
+    python benchmarks/precision.py [p ...]
+
+For each graph, S is built and all node regressions are solved once per
+precision. The script reports the best untraced wall times of building S
+and of the regressions, peak memory from a separate traced run
+(tracemalloc sees every NumPy allocation but slows the small ones down)
+and whether the selected edge sets match.
+
+On one core, for chains of p = 1000 to 4000 with n = p / 2, float32 finds
+the same edges, halves the peak memory (244 -> 122 MB at p = 4000) and
+builds S 1.5-1.7x faster. The regressions are not faster in float32
+(0.85-0.95x): with the full sweep vectorised, each node costs a few dozen
+NumPy calls whose overhead outweighs the row traffic. So the total wall
+time of float32 stays at or slightly below parity with float64.
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from neighborhood import (
+    NEIGHBORHOOD_EDGES,
+    edge_list,
+    empirical_covariance,
+    lambda_max,
+    neighborhood_selection,
+    precision_from_edges,
+    sample_gaussian,
+)
+
+
+def chain_graph(p):
+    """
+    Chain 0 - 1 - ... - p-1 plus one long-range edge every 10 nodes.
+    """
+    return [(i, i + 1) for i in range(p - 1)] + [(i, i + 5) for i in range(0, p - 5, 10)]
+
+
+def timed(solve):
+    start = time.perf_counter()
+    result = solve()
+    return result, time.perf_counter() - start
+
+
+def run(X, lam, dtypes, repeat=7):
+    """
+    Best times (covariance, regressions) per dtype, the dtypes taking turns
+    so that both see the same machine load.
+    """
+    data = {dtype: X.astype(dtype) for dtype in dtypes}
+    best = {dtype: [float("inf")] * 2 for dtype in dtypes}
+    for _ in range(repeat):
+        for dtype in dtypes:
+            S, covariance = timed(lambda: empirical_covariance(data[dtype], dtype=dtype))
+            _, regressions = timed(lambda: neighborhood_selection(S, lam))
+            best[dtype] = [min(best[dtype][0], covariance), min(best[dtype][1], regressions)]
+    return best
+
+
+def traced(X, dtype, lam):
+    """
+    Edges found and peak traced memory in MB.
+    """
+    X = X.astype(dtype)
+    tracemalloc.start()
+    coef = neighborhood_selection(empirical_covariance(X, dtype=dtype), lam)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return edge_list(coef), peak / 2**20
+
+
+def main(sizes):
+    graphs = [("LassoNeighborhood", 8, NEIGHBORHOOD_EDGES)]
+    graphs += [(f"chaîne p={p}", p, chain_graph(p)) for p in sizes]
+    dtypes = (np.float64, np.float32)
+
+    print(f"{'graphe':<20} {'dtype':<8} {'S (s)':>8} {'régr. (s)':>10} {'total (s)':>10} {'gain':>6} "
+          f"{'mémoire (Mo)':>13} {'arêtes':>7}  identiques")
+    for name, p, edges in graphs:
+        X = sample_gaussian(precision_from_edges(p, edges), n=max(200, p // 2))
+        lam = 0.3 * lambda_max(empirical_covariance(X))
+        times = run(X, lam, dtypes)
+        reference = baseline = None
+        for dtype in dtypes:
+            found, peak = traced(X, dtype, lam)
+            covariance, regressions = times[dtype]
+            total = covariance + regressions
+            same = "" if reference is None else ("oui" if found == reference else "NON")
+            reference = reference or found
+            baseline = baseline or total
+            print(f"{name:<20} {np.dtype(dtype).name:<8} {covariance:>8.3f} {regressions:>10.3f} {total:>10.3f} "
+                  f"{baseline / total:>5.2f}x {peak:>13.1f} {len(found):>7}  {same}")
+
+
+if __name__ == "__main__":
+    main([int(p) for p in sys.argv[1:]] or [200, 1000])
@@ -0,0 +1,56 @@
+"""
+Shrinkage baselines vs graphical lasso when n < p.
+
+    python benchmarks/shrinkage.py [p ...]
+
+Data are drawn from the chain graphs of precision.py with n = p / 4, where
+Sigma_hat^-1 does not exist. For each p the script reports wall time and
+relative Frobenius error ||Omega_hat - Omega||_F / ||Omega||_F of the
+Ledoit-Wolf and OAS precisions (Woodbury form, densified only to measure
+the error) and, up to p = 200, of the graphical lasso.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from glasso import graphical_lasso
+from neighborhood import lambda_max, precision_from_edges, sample_gaussian
+from online import SufficientStats
+from precision import chain_graph
+from shrinkage import ledoit_wolf, oas, shrunk_precision
+
+
+def error(estimate, omega):
+    estimate = estimate.toarray() if hasattr(estimate, "toarray") else estimate
+    return np.linalg.norm(estimate - omega) / np.linalg.norm(omega)
+
+
+def main(sizes):
+    print(f"{'p':>6} {'n':>5} {'méthode':<12} {'delta':>7} {'temps (s)':>10} {'erreur':>8}")
+    for p in sizes:
+        omega = precision_from_edges(p, chain_graph(p))
+        X = sample_gaussian(omega, n=p // 4)
+        start = time.perf_counter()
+        stats = SufficientStats.from_batch(X)
+        base = time.perf_counter() - start
+        for name, estimator in (("Ledoit-Wolf", ledoit_wolf), ("OAS", oas)):
+            start = time.perf_counter()
+            delta, mu = estimator(stats)
+            estimate = shrunk_precision(stats, delta, mu)
+            elapsed = base + time.perf_counter() - start
+            print(f"{p:>6} {len(X):>5} {name:<12} {delta:>7.3f} {elapsed:>10.2f} {error(estimate, omega):>8.3f}")
+        if p <= 200:
+            S = stats.covariance()
+            start = time.perf_counter()
+            estimate, _ = graphical_lasso(S, 0.3 * lambda_max(S))
+            elapsed = base + time.perf_counter() - start
+            print(f"{p:>6} {len(X):>5} {'glasso':<12} {'':>7} {elapsed:>10.2f} {error(estimate, omega):>8.3f}")
+
+
+if __name__ == "__main__":
+    main([int(p) for p in sys.argv[1:]] or [100, 200, 2000])
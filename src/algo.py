@@ -1,5 +1,22 @@
 from manim import *
 
+from artifact import edge_weights, load_artifact
+from layout import cached_layout
+from neighborhood import NEIGHBORHOOD_EDGES
+
+
+def split_neighborhoods(edges, first=3):
+    """
+    Edges added by ne_0, ..., ne_{first-1} in turn (each only the new ones),
+    followed by all the remaining edges.
+    """
+    remaining = list(edges)
+    groups = []
+    for a in range(first):
+        groups.append([e for e in remaining if a in e])
+        remaining = [e for e in remaining if a not in e]
+    return groups + [remaining]
+
 class LassoNeighborhood(Scene):
     """
     Neighborhood Graph Construction
@@ -16,11 +33,18 @@ class LassoNeighborhood(Scene):
         ### Initialisation du graphe ###########################################
         ########################################################################
 
-        nodes = 8
+        # Graphe estimé par src/pipeline.py si $GRAPH_ARTIFACT est défini
+        fit = load_artifact()
+        nodes = 8 if fit is None else fit["p"]
+        final_edges = NEIGHBORHOOD_EDGES if fit is None else fit["edges"]
+        # Attraction des arêtes estimées proportionnelle à leurs coefficients
+        weights = None if fit is None else edge_weights(fit)
+        ne_0, ne_1, ne_2, ne_ = split_neighborhoods(final_edges)
+
         graph = Graph(
             vertices = list(range(nodes)),
             edges=[],
-            layout="circular",
+            layout=cached_layout(range(nodes), final_edges, weights),
             labels=True,
             label_fill_color=BLUE,
         )
@@ -37,7 +61,6 @@ class LassoNeighborhood(Scene):
         title = MathTex("ne_0", color=BLUE, font_size=DEFAULT_FONT_SIZE*2).to_edge(UP)
         self.play(Write(title))
 
-        ne_0 = [(0, 1), (0, 2), (0, 4), (0, 6)]
         for edge in ne_0:
             graph.add_edges(edge)
             self.play(Create(graph.edges[edge]), run_time=1)
@@ -64,25 +87,26 @@ class LassoNeighborhood(Scene):
             MathTex(r"\text{donc } (0,1)\in \hat E^{\land}")
         ).arrange(DOWN, aligned_edge=LEFT, buff=MED_LARGE_BUFF)
 
-        graph.add_edges((1,0), edge_config={"stroke_color":GREEN})
-        self.play(
-            ShowPassingFlash(
-                graph.edges[(1,0)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
-                time_width=0.3,
-            ), FadeOut(graph.edges[(1,0)]),
-            FadeIn(equations.next_to(graph, RIGHT).scale(0.7)),
-            run_time=3
-        )
+        # Les arêtes (1,0), (2,1), (2,0) n'illustrent que le graphe d'exemple
+        if fit is None:
+            graph.add_edges((1,0), edge_config={"stroke_color":GREEN})
+            self.play(
+                ShowPassingFlash(
+                    graph.edges[(1,0)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
+                    time_width=0.3,
+                ), FadeOut(graph.edges[(1,0)]),
+                FadeIn(equations.next_to(graph, RIGHT).scale(0.7)),
+                run_time=3
+            )
 
-        self.wait(2)
+            self.wait(2)
 
-        ne_1 = [(1, 2), (1, 3), (1, 6)]
         for edge in ne_1:
             graph.add_edges(edge)
             self.play(Create(graph.edges[edge]), run_time=1)
 
         self.wait(2)
-        self.play(Unwrite(title),FadeOut(equations))
+        self.play(Unwrite(title), *([FadeOut(equations)] if fit is None else []))
 
 
         ########################################################################
@@ -100,27 +124,28 @@ class LassoNeighborhood(Scene):
             MathTex(r"\text{donc } (0,2) \in \hat E^{\lor}")
         ).arrange(DOWN, aligned_edge=LEFT, buff=MED_LARGE_BUFF)
 
-        graph.add_edges((2,1), edge_config={"stroke_color":GREEN})
-        self.play(
-            ShowPassingFlash(
-                graph.edges[(2,1)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
-                time_width=0.3
-            ), FadeOut(graph.edges[(2,1)]),
-            run_time=3
-        )
-
-        graph.add_edges((2,0), edge_config={"stroke_color":RED})
-        self.play(
-            ShowPassingFlash(
-                graph.edges[(2,0)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
-                time_width=0.3
-            ), FadeOut(graph.edges[(2,0)]),
-            FadeIn(equations.next_to(graph, RIGHT).scale(0.7)),
-            run_time=3
-        )
-
-        self.wait(2)
-        self.play(FadeOut(equations))
+        if fit is None:
+            graph.add_edges((2,1), edge_config={"stroke_color":GREEN})
+            self.play(
+                ShowPassingFlash(
+                    graph.edges[(2,1)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
+                    time_width=0.3
+                ), FadeOut(graph.edges[(2,1)]),
+                run_time=3
+            )
+
+            graph.add_edges((2,0), edge_config={"stroke_color":RED})
+            self.play(
+                ShowPassingFlash(
+                    graph.edges[(2,0)].copy().set_stroke(width=DEFAULT_STROKE_WIDTH*3),
+                    time_width=0.3
+                ), FadeOut(graph.edges[(2,0)]),
+                FadeIn(equations.next_to(graph, RIGHT).scale(0.7)),
+                run_time=3
+            )
+
+            self.wait(2)
+            self.play(FadeOut(equations))
 
         precision = Matrix(
             [
@@ -139,7 +164,6 @@ class LassoNeighborhood(Scene):
         self.play(FadeIn(pgroup))
         self.wait(2)
 
-        ne_2 = [(2, 4), (2, 5), (2, 7)]
         for edge in ne_2:
             graph.add_edges(edge)
             self.play(Create(graph.edges[edge]), run_time=1)
@@ -155,9 +179,12 @@ class LassoNeighborhood(Scene):
         title = MathTex("...", color=BLUE, font_size=DEFAULT_FONT_SIZE*2).to_edge(UP)
         self.play(Write(title))
 
-        ne_ = [(3,6), (7,5), (6,4)]
-        for edge in ne_:
-            graph.add_edges(edge)
-            self.play(Create(graph.edges[edge]))
+        # Toutes les arêtes restantes en une seule animation
+        if ne_:
+            graph.add_edges(*ne_)
+            self.play(
+                LaggedStart(*[Create(graph.edges[edge]) for edge in ne_], lag_ratio=0.5),
+                run_time=min(len(ne_), 5)
+            )
 
         self.wait(2)
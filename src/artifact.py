@@ -0,0 +1,60 @@
+"""
+Fitted-graph artifacts shared by the pipeline and the scenes.
+
+An artifact is a directory holding
+    graph.json   metadata, variable names and the edge list
+    arrays.npz   coefficient matrix (and precision matrix for glasso), and
+                 with --refit the refitted Omega (refit_diag, and
+                 refit_offdiag / partial_correlation in edge order)
+
+Scenes render the graph of the artifact named by $GRAPH_ARTIFACT, and
+fall back to their hardcoded example graph when it is unset.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+ARTIFACT_ENV = "GRAPH_ARTIFACT"
+
+
+def save_artifact(directory, meta, edges, **arrays):
+    """
+    Write graph.json and arrays.npz into `directory`.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(directory / "arrays.npz", **arrays)
+    with open(directory / "graph.json", "w") as f:
+        json.dump({**meta, "edges": [list(e) for e in edges]}, f, indent=1)
+
+
+def load_artifact(directory=None):
+    """
+    Read an artifact, by default the one named by $GRAPH_ARTIFACT.
+    Returns None when no artifact is configured.
+    """
+    directory = directory or os.environ.get(ARTIFACT_ENV)
+    if not directory:
+        return None
+    directory = Path(directory)
+    with open(directory / "graph.json") as f:
+        graph = json.load(f)
+    graph["edges"] = [tuple(e) for e in graph["edges"]]
+    with np.load(directory / "arrays.npz") as arrays:
+        graph.update({name: arrays[name] for name in arrays.files})
+    return graph
+
+
+def edge_weights(graph):
+    """
+    Weight of each edge of an artifact, min(|theta^a_b|, |theta^b_a|), or
+    the one non-zero coefficient of an E^or edge selected by one side only.
+    """
+    coef = np.abs(graph["coef"])
+    a, b = np.array(graph["edges"], dtype=int).reshape(-1, 2).T
+    low, high = np.minimum(coef[a, b], coef[b, a]), np.maximum(coef[a, b], coef[b, a])
+    return np.where(low > 0, low, high)
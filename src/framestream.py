@@ -0,0 +1,223 @@
+"""
+Raw frame output: a memory-mapped ring buffer or a pipe instead of a video.
+
+    python src/framestream.py --ring media/frames/intro.ring src/intro.py IntroScene
+    python src/framestream.py --pipe - src/algo.py LassoNeighborhood \
+        | ffplay -f rawvideo -pixel_format rgba -video_size 1600x900 -framerate 30 -i -
+
+Each frame leaves the renderer as RGBA bytes at the resolution and rate of
+manim.cfg (1600x900 @ 30 fps): no partial movie files, no PNG, no encode.
+
+The ring file is a 64-byte header followed by `slots` frames. Frame i goes
+to slot i % slots and the header counter `written` is bumped once it is
+complete, so a reader in another process maps the same file and gets
+frames as NumPy views, while the render is still running:
+
+    ring = FrameRing.open("media/frames/intro.ring")
+    for index, frame in ring.frames():
+        ...   # (900, 1600, 4) uint8, valid until the writer laps it
+
+A slow reader can be lapped while it still holds a view. Like a seqlock
+reader, `frames` re-reads `written` once the consumer is done with a frame
+and records the frames overwritten meanwhile in `ring.torn`; with
+copy=True it copies each frame first and skips the torn copies instead.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("height", "<i8"),
+    ("width", "<i8"),
+    ("channels", "<i8"),
+    ("slots", "<i8"),
+    ("frame_rate", "<f8"),
+    ("written", "<i8"),
+    ("done", "<i8"),
+])
+MAGIC = b"MNMRING1"
+
+
+class FrameRing:
+    """
+    Fixed-size ring of frames in a memory-mapped file, one writer, any
+    number of readers.
+    """
+
+    def __init__(self, path, mode):
+        self.path = Path(path)
+        self.header = np.memmap(self.path, dtype=HEADER, mode=mode, shape=())
+        if self.header["magic"] != MAGIC:
+            raise ValueError(f"{self.path} n'est pas un anneau d'images")
+        shape = tuple(int(self.header[k]) for k in ("slots", "height", "width", "channels"))
+        self.slots = np.memmap(self.path, dtype=np.uint8, mode=mode, offset=HEADER.itemsize, shape=shape)
+        self.torn = []
+
+    @classmethod
+    def create(cls, path, height, width, channels=4, slots=90, frame_rate=30.0):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.truncate(HEADER.itemsize + slots * height * width * channels)
+        header = np.memmap(path, dtype=HEADER, mode="r+", shape=())
+        header[()] = (MAGIC, height, width, channels, slots, frame_rate, 0, 0)
+        header.flush()
+        return cls(path, "r+")
+
+    @classmethod
+    def open(cls, path):
+        return cls(path, "r")
+
+    def write(self, frame, num_frames=1):
+        for _ in range(num_frames):
+            written = int(self.header["written"])
+            np.copyto(self.slots[written % len(self.slots)], frame)
+            # Le compteur n'avance qu'une fois l'image complète
+            self.header["written"] = written + 1
+
+    def close(self):
+        self.header["done"] = 1
+        self.header.flush()
+        self.slots.flush()
+
+    def intact(self, index):
+        """
+        Whether frame `index` is still whole in its slot. The frame being
+        written is `written`, so frame `index` is safe while
+        written < index + slots.
+        """
+        return int(self.header["written"]) - index < len(self.slots)
+
+    def frames(self, start=0, poll=0.005, copy=False):
+        """
+        (index, frame) from frame `start` on, waiting for the writer. Frames
+        already overwritten are skipped. Views overwritten while the consumer
+        held them are listed in `self.torn`; with `copy`, frames are copied
+        and torn copies are skipped.
+        """
+        index = start
+        while True:
+            written = int(self.header["written"])
+            if index >= written:
+                if self.header["done"]:
+                    return
+                time.sleep(poll)
+                continue
+            index = max(index, written - len(self.slots) + 1)
+            frame = self.slots[index % len(self.slots)]
+            if copy:
+                frame = frame.copy()
+                # Copie relue après coup : l'écrivain a pu la déchirer
+                if self.intact(index):
+                    yield index, frame
+            else:
+                yield index, frame
+                if not self.intact(index):
+                    self.torn.append(index)
+            index += 1
+
+
+class PipeSink:
+    """
+    Raw RGBA frames written back to back to a binary stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, frame, num_frames=1):
+        data = memoryview(np.ascontiguousarray(frame)).cast("B")
+        for _ in range(num_frames):
+            self.stream.write(data)
+
+    def close(self):
+        self.stream.flush()
+        if self.stream is not sys.__stdout__.buffer:
+            self.stream.close()
+
+
+def streaming_writer(sink):
+    """
+    SceneFileWriter class sending the frames to `sink` instead of a movie.
+    """
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    class StreamingFileWriter(SceneFileWriter):
+        def begin_animation(self, allow_write=False, file_path=None):
+            pass
+
+        def end_animation(self, allow_write=False):
+            pass
+
+        def write_frame(self, frame_or_renderer, num_frames=1):
+            sink.write(frame_or_renderer, num_frames)
+
+        def combine_to_movie(self):
+            pass
+
+        def finish(self):
+            # Fermé par stream_scene, y compris quand le rendu échoue
+            pass
+
+    return StreamingFileWriter
+
+
+def stream_scene(path, scene_name, sink):
+    """
+    Render one scene into `sink`, frame by frame.
+    """
+    from manim import tempconfig
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    from storyboard import load_scenes
+
+    scene_class = load_scenes(path)[scene_name]
+    settings = {
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }
+    with tempconfig(settings):
+        renderer = CairoRenderer(file_writer_class=streaming_writer(sink))
+        try:
+            scene_class(renderer=renderer).render()
+        finally:
+            # done est posé même sur erreur : les lecteurs n'attendent pas indéfiniment
+            sink.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("scene_file")
+    parser.add_argument("scene")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--ring", help="memory-mapped ring buffer file")
+    target.add_argument("--pipe", help="'-' for stdout, or a FIFO / file path")
+    parser.add_argument("--slots", type=int, default=90, help="frames held by the ring")
+    args = parser.parse_args(argv)
+
+    from manim import config
+
+    if args.ring:
+        sink = FrameRing.create(args.ring, config.pixel_height, config.pixel_width,
+                                slots=args.slots, frame_rate=config.frame_rate)
+    elif args.pipe == "-":
+        sink = PipeSink(sys.stdout.buffer)
+        # Les journaux de manim ne doivent pas se mêler aux images
+        sys.stdout = sys.stderr
+    else:
+        sink = PipeSink(open(args.pipe, "wb"))
+    stream_scene(args.scene_file, args.scene, sink)
+    print(f"{args.scene} -> {args.ring or args.pipe}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Raster heatmaps for precision and coefficient matrices.
+
+The whole matrix is rasterised once into a single image mobject, one pixel
+per entry, upscaled with nearest-neighbour resampling by the camera. This
+replaces the p^2 squares and p^2 Pango labels of the schematic matrices.
+"""
+
+import numpy as np
+from manim import *
+
+
+ZERO_COLOR = GREEN
+NONZERO_COLOR = ORANGE
+DIAGONAL_COLOR = WHITE
+HIDDEN_COLOR = GREY_E
+
+
+def matrix_to_rgba(matrix, tol=1e-10, nonzero_color=NONZERO_COLOR,
+                   diagonal_color=DIAGONAL_COLOR, background_color=BLACK):
+    """
+    Map a (p, q) matrix to a (p, q, 4) uint8 RGBA pixel array.
+    Off-diagonal entries are shaded by |value| relative to the largest
+    off-diagonal magnitude, entries with |value| <= tol get the background.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    magnitude = np.abs(matrix)
+    diagonal = np.eye(*matrix.shape, dtype=bool)
+
+    off_diagonal = np.where(diagonal, 0.0, magnitude)
+    scale = off_diagonal.max()
+    weight = off_diagonal / scale if scale > tol else off_diagonal
+
+    background = color_to_int_rgb(background_color).astype(float)
+    nonzero = color_to_int_rgb(nonzero_color).astype(float)
+    rgb = background + weight[..., None] * (nonzero - background)
+    rgb[diagonal] = color_to_int_rgb(diagonal_color)
+    rgb[(magnitude <= tol) & ~diagonal] = background
+
+    pixels = np.empty(matrix.shape + (4,), dtype=np.uint8)
+    pixels[..., :3] = np.round(rgb)
+    pixels[..., 3] = 255
+    return pixels
+
+
+class MatrixHeatmap(ImageMobject):
+    """
+    Heatmap of an estimated Omega or coefficient matrix.
+
+    Zero entries start hidden and are coloured by `reveal_zeros`, which
+    writes straight into the pixel buffer (see `RevealZeros`).
+    """
+
+    def __init__(self, matrix, height=4, tol=1e-10, zero_color=ZERO_COLOR,
+                 hidden_color=HIDDEN_COLOR, **kwargs):
+        self.tol = tol
+        self.zero_rgba = color_to_int_rgba(zero_color)
+        self.hidden_rgba = color_to_int_rgba(hidden_color)
+        shape = np.shape(matrix) + (4,)
+        super().__init__(np.zeros(shape, dtype=np.uint8), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.height = height
+        self.set_matrix(matrix, revealed=0)
+
+    def set_matrix(self, matrix, revealed=1):
+        """
+        Re-rasterise in place from a matrix of the same shape.
+        """
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.pixel_array[...] = matrix_to_rgba(self.matrix, tol=self.tol)
+        zeros = np.abs(self.matrix) <= self.tol
+        zeros &= ~np.eye(*self.matrix.shape, dtype=bool)
+        self.zero_order = np.flatnonzero(zeros)
+        return self.reveal_zeros(revealed)
+
+    def reveal_zeros(self, alpha):
+        """
+        Colour the first `alpha` fraction of zeros (row-major order).
+        """
+        count = int(round(alpha * len(self.zero_order)))
+        flat = self.pixel_array.reshape(-1, 4)
+        flat[self.zero_order[:count]] = self.zero_rgba
+        flat[self.zero_order[count:]] = self.hidden_rgba
+        return self
+
+
+class RevealZeros(Animation):
+    """
+    Progressively reveal the zero pattern of a `MatrixHeatmap`.
+    """
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.reveal_zeros(self.rate_func(alpha))
@@ -14,6 +14,9 @@ import numpy as np
 import itertools
 import random
 
+from artifact import edge_weights, load_artifact
+from layout import cached_layout
+
 # Global style constants (tweak to your taste)
 PRIMARY_COLOR = YELLOW
 SECONDARY_COLOR = BLUE
@@ -78,23 +81,6 @@ class IntroScene(Scene):
         arrow = Arrow(table_block.get_right(), table_block.get_right() + RIGHT*3, buff=0.5, color=YELLOW)
         self.play(GrowArrow(arrow), run_time=1)
 
-        # Graphe à droite du tableau
-        num_nodes = 10
-        nodes = []
-        positions = []
-        radius = 2.0
-        for k in range(num_nodes):
-            theta = 2*np.pi*k/num_nodes
-            x = radius*np.cos(theta) + 4.0
-            y = radius*np.sin(theta)
-            pos = np.array([x, y, 0])
-            positions.append(pos)
-            c = Dot(pos, color=WHITE)
-            nodes.append(c)
-
-        nodes_group = VGroup(*nodes)
-        self.play(FadeIn(nodes_group), run_time=2)
-
         # Connexions fixes non symétriques
         connections = [
             (0,1),(0,3),(0,7),(0,6),
@@ -108,6 +94,22 @@ class IntroScene(Scene):
             (8,9)
         ]
 
+        # Graphe estimé par src/pipeline.py si $GRAPH_ARTIFACT est défini
+        fit = load_artifact()
+        weights = None
+        if fit is not None:
+            connections = fit["edges"]
+            weights = edge_weights(fit)
+
+        # Graphe à droite du tableau, disposition force-dirigée (en cache)
+        num_nodes = 10 if fit is None else fit["p"]
+        layout = cached_layout(range(num_nodes), connections, weights, scale=2.0)
+        positions = [layout[k] + RIGHT*4.0 for k in range(num_nodes)]
+        nodes = [Dot(pos, color=WHITE) for pos in positions]
+
+        nodes_group = VGroup(*nodes)
+        self.play(FadeIn(nodes_group), run_time=2)
+
         edges = []
         for i,j in connections:
             e = Line(positions[i], positions[j], color=GREY_B, stroke_width=1)
@@ -269,10 +271,12 @@ def draw_schematic_matrix(rows=6, cols=6, font_size=28, dotted_border=False):
         mat = VGroup(mat, rect)
     return mat
 
-def draw_precision_matrix_with_zeros(p, font_size=28):
+def draw_precision_matrix_with_zeros(p, font_size=28, matrix=None):
     """
     Build a schematic precision matrix Ω showing zeros and non-zeros.
-    Simple heuristic: diagonal non-zero, off-diagonal sparse random zeros/non-zeros.
+    If `matrix` (an estimated Ω or coefficient matrix) is given, its zero pattern
+    is used; otherwise off-diagonal entries are random zeros/non-zeros.
+    Only meant for small p: for large p use heatmap.MatrixHeatmap.
     """
     squares = []
     labels = []
@@ -283,13 +287,16 @@ def draw_precision_matrix_with_zeros(p, font_size=28):
             sq.move_to(np.array([0.45*(j - p/2), -0.45*(i - p/2), 0]))
             squares.append(sq)
 
-            # Heuristic: diagonal always nonzero, off-diagonal random zero/nonzero
+            # Diagonal always nonzero, off-diagonal from the matrix (or random)
             if i == j:
                 val = "•"  # indicates non-zero diagonal
                 color = WHITE
             else:
-                # Randomly choose zero/non-zero
-                if random.random() < 0.7:
+                if matrix is not None:
+                    is_zero = matrix[i][j] == 0
+                else:
+                    is_zero = random.random() < 0.7
+                if is_zero:
                     val = "0"
                     color = ZERO_HL_COLOR
                 else:
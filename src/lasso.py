@@ -3,6 +3,67 @@ Visualization module for Gaussian Graphical Models.
 """
 
 from manim import *
+import numpy as np
+
+
+########################################################################
+### Problème des moindres carrés en 2D #################################
+########################################################################
+
+def least_squares_2d(n=50, theta=(1.5, 0.6), noise=0.5, seed=0):
+    """
+    Simulated 2-D regression. Returns (A, theta_ols) such that
+    n^-1 ||y - X theta||^2 = (theta - theta_ols)^T A (theta - theta_ols) + cst.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.multivariate_normal([0, 0], [[1, 0.5], [0.5, 1]], size=n)
+    y = X @ np.array(theta) + noise * rng.standard_normal(n)
+    A = X.T @ X / n
+    return A, np.linalg.solve(A, X.T @ y / n)
+
+
+def lasso_2d(A, theta_ols, lambdas):
+    """
+    Exact minimisers (len(lambdas), 2) of
+    (theta - theta_ols)^T A (theta - theta_ols) + lam ||theta||_1.
+
+    Every support and sign pattern has a closed-form stationary point; the
+    true minimiser is one of them, so the candidate with the smallest
+    objective is exact. All lambdas are solved in one batch.
+    """
+    lambdas = np.asarray(lambdas, dtype=float)[:, None]
+    signs = np.array([[1, 1], [1, -1], [-1, 1], [-1, -1]])
+    # Deux coefficients non nuls : theta = theta_ols - lam/2 A^-1 s
+    both = theta_ols - lambdas[:, :, None] / 2 * (signs @ np.linalg.inv(A))
+    # Un seul coefficient non nul
+    single = []
+    for b in range(2):
+        z = theta_ols[b] + A[b, 1 - b] * theta_ols[1 - b] / A[b, b]
+        value = np.sign(z) * np.maximum(abs(z) - lambdas / (2 * A[b, b]), 0)
+        point = np.zeros((len(lambdas), 1, 2))
+        point[:, 0, b] = value[:, 0]
+        single.append(point)
+    zero = np.zeros((len(lambdas), 1, 2))
+    candidates = np.concatenate([both, *single, zero], axis=1)
+
+    diff = candidates - theta_ols
+    objective = np.einsum("lci,ij,lcj->lc", diff, A, diff)
+    objective += lambdas * np.abs(candidates).sum(axis=2)
+    best = objective.argmin(axis=1)
+    return candidates[np.arange(len(lambdas)), best]
+
+
+def mse_contours(A, theta_ols, points, num=120):
+    """
+    MSE level sets through each of `points`, as (len(points), num, 2)
+    ellipses theta_ols + sqrt(level) L^-T u, with A = L L^T and |u| = 1.
+    """
+    diff = points - theta_ols
+    levels = np.einsum("li,ij,lj->l", diff, A, diff)
+    angles = np.linspace(0, 2 * np.pi, num)
+    circle = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    unit = circle @ np.linalg.inv(np.linalg.cholesky(A))
+    return theta_ols + np.sqrt(levels)[:, None, None] * unit
 
 
 class LassoIntroduction(Scene):
@@ -92,30 +153,56 @@ class LassoIntroduction(Scene):
         ).next_to(full,DOWN)
         self.play(Create(plane))
 
+        # Géométrie exacte d'un vrai problème de moindres carrés 2D,
+        # précalculée en un seul lot pour tout le balayage de lambda ;
+        # theta et lambda sont choisis pour que chaque ellipse reste dans le plan
+        A, theta_ols = least_squares_2d()
+        lambdas = np.linspace(1.8, 0.3, 200)
+        solutions = lasso_2d(A, theta_ols, lambdas)
+        contours = mse_contours(A, theta_ols, solutions)
+        radii = np.abs(solutions).sum(axis=1)
+        tracker = ValueTracker(0)
+
+        # Le plan est une application affine : on la vectorise une fois
+        origin = plane.c2p(0, 0)
+        basis = np.array([plane.c2p(1, 0) - origin, plane.c2p(0, 1) - origin])
+        unit_diamond = np.array([[0, 1], [1, 0], [0, -1], [-1, 0], [0, 1]])
+
+        def to_scene(coordinates):
+            return origin + np.asarray(coordinates) @ basis
+
+        def frame_index():
+            return int(round(tracker.get_value()))
+
         diamond = Polygon(
-            [0, 2, 0],
-            [2, 0, 0],
-            [0, -2, 0],
-            [-2, 0, 0],
+            *to_scene(radii[0] * unit_diamond[:-1]),
             color=BLUE,
             fill_opacity=0.2,
             stroke_width=4
-        ).move_to(plane)
+        )
 
-        ellipse = Ellipse(
-            width=3,
-            height=2,
+        ellipse = VMobject(
             color=PURPLE,
             fill_opacity=0.1,
             stroke_width=4
-        ).next_to(diamond, RIGHT, buff=-0.15).rotate(PI/6, axis=OUT)
+        ).set_points_smoothly(to_scene(contours[0]))
 
-        touch = Dot(color=YELLOW).move_to(diamond.get_right())
+        touch = Dot(to_scene(solutions[0]), color=YELLOW)
 
         self.play(Create(diamond))
         self.play(Create(ellipse))
         self.play(FadeIn(touch))
 
+        theta_x = DecimalNumber(solutions[0][0], font_size=DEFAULT_FONT_SIZE*0.6, color=YELLOW)
+        theta_y = DecimalNumber(solutions[0][1], font_size=DEFAULT_FONT_SIZE*0.6, color=YELLOW)
+        coordinates = VGroup(
+            MathTex(r"\theta=(", font_size=DEFAULT_FONT_SIZE*0.6, color=YELLOW),
+            theta_x,
+            MathTex(r",", font_size=DEFAULT_FONT_SIZE*0.6, color=YELLOW),
+            theta_y,
+            MathTex(r")", font_size=DEFAULT_FONT_SIZE*0.6, color=YELLOW),
+        ).arrange(RIGHT, buff=0.05)
+
         labels = VGroup(
             MathTex(
                 r"\lambda\Vert\theta\Vert_1", 
@@ -127,14 +214,35 @@ class LassoIntroduction(Scene):
                 font_size=DEFAULT_FONT_SIZE*0.6,
                 color=PURPLE
             ).next_to(ellipse, UP, buff=0.4),
-            MathTex(
-                r"\text{Intersection} \\",
-                r"\text{au minimum} \\",
-                r"\theta=(2,0)", 
-                font_size=DEFAULT_FONT_SIZE*0.6,
-                color=YELLOW
-            ).next_to(touch, LEFT, buff=0.2)
+            VGroup(
+                MathTex(
+                    r"\text{Intersection} \\",
+                    r"\text{au minimum}",
+                    font_size=DEFAULT_FONT_SIZE*0.6,
+                    color=YELLOW
+                ),
+                coordinates
+            ).arrange(DOWN, buff=0.1).next_to(touch, LEFT, buff=0.2)
         )
         self.play(FadeIn(labels))
         self.wait(2)
 
+        ########################################################################
+        ### Balayage de lambda #################################################
+        ########################################################################
+
+        # Chaque frame lit une ligne des tableaux précalculés, sans recréer
+        # de mobjects
+        diamond.add_updater(
+            lambda m: m.set_points_as_corners(to_scene(radii[frame_index()] * unit_diamond))
+        )
+        ellipse.add_updater(lambda m: m.set_points_smoothly(to_scene(contours[frame_index()])))
+        touch.add_updater(lambda m: m.move_to(to_scene(solutions[frame_index()])))
+        theta_x.add_updater(lambda m: m.set_value(solutions[frame_index()][0]))
+        theta_y.add_updater(lambda m: m.set_value(solutions[frame_index()][1]))
+        labels[0].add_updater(lambda m: m.next_to(diamond, UP, buff=0.4))
+        labels[1].add_updater(lambda m: m.next_to(ellipse, UP, buff=0.4))
+        labels[2].add_updater(lambda m: m.next_to(touch, LEFT, buff=0.2))
+
+        self.play(tracker.animate.set_value(len(lambdas) - 1), run_time=6, rate_func=linear)
+        self.wait(2)
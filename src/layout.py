@@ -0,0 +1,192 @@
+"""
+Force-directed graph layouts with a Barnes-Hut approximation and a disk cache.
+
+Repulsion between the n nodes is approximated on an adaptive quadtree: a
+cell is split while it holds more than a few nodes, so dense clusters get
+deeper cells instead of crowded ones. Each node walks the tree from the
+root and stops at every cell that is small compared with its distance
+(size / distance < theta), which then acts through its centre of mass;
+nodes of the leaves it still reaches are computed exactly. The walk is
+vectorised over all (node, cell) pairs of a level, so one iteration costs
+O(n log n) NumPy work instead of O(n^2), clustered or not.
+
+Positions are cached on disk under a hash of the graph, so consecutive
+scenes and re-renders reuse them.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+LAYOUT_CACHE_DIR = Path("media") / "layouts"
+
+_memory_cache = {}
+
+
+def _quadtree(unit, cap, max_depth):
+    """
+    Adaptive quadtree of points in the unit square. Returns (order, levels):
+    the nodes sorted along the Z (Morton) curve, and for each level the
+    sorted Morton keys of its non-empty cells, their [start, end) ranges in
+    `order` and whether they are leaves. A cell is split while it holds more
+    than `cap` nodes, down to `max_depth`.
+    """
+    side = 2 ** max_depth
+    cell = np.minimum((unit * side).astype(np.int64), side - 1)
+    # Clé de Morton : bits de x et de y entrelacés, du plus fort au plus faible
+    deep = np.zeros(len(unit), dtype=np.int64)
+    for bit in range(max_depth - 1, -1, -1):
+        deep = 4 * deep + 2 * ((cell[:, 0] >> bit) & 1) + ((cell[:, 1] >> bit) & 1)
+    order = np.argsort(deep, kind="stable")
+    deep = deep[order]
+
+    levels = []
+    for level in range(max_depth + 1):
+        # Sur la courbe en Z, chaque cellule est un intervalle de `order`
+        keys, starts, counts = np.unique(deep >> 2 * (max_depth - level), return_index=True, return_counts=True)
+        leaf = (counts <= cap) | (level == max_depth)
+        levels.append((keys, starts, starts + counts, leaf))
+        if leaf.all():
+            break
+    return order, levels
+
+
+def _expand(first, counts):
+    """
+    Concatenated ranges first[m], ..., first[m] + counts[m] - 1, and the
+    index m of the range each entry comes from.
+    """
+    owner = np.repeat(np.arange(len(first)), counts)
+    return np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts), owner
+
+
+def barnes_hut_repulsion(pos, k, theta=0.5, cap=8, max_depth=20):
+    """
+    Approximate Fruchterman-Reingold repulsion sum_j k^2 (x_i - x_j) / |x_i - x_j|^2.
+    """
+    n = len(pos)
+    low = pos.min(axis=0)
+    span = (pos.max(axis=0) - low).max() + 1e-9
+    order, levels = _quadtree((pos - low) / span, cap, max_depth)
+    rank = np.empty(n, dtype=int)
+    rank[order] = np.arange(n)
+    # Sommes cumulées le long de la courbe : centre de masse de tout intervalle
+    total = np.concatenate((np.zeros((1, 2)), np.cumsum(pos[order], axis=0)))
+
+    sources, weights, deltas = [], [], []
+    # Front de parcours : couples (nœud, cellule) encore à examiner
+    node, cell = np.arange(n), np.zeros(n, dtype=int)
+    for level, (keys, starts, ends, leaf) in enumerate(levels):
+        start, end = starts[cell], ends[cell]
+        mass = end - start
+        delta = pos[node] - (total[end] - total[start]) / mass[:, None]
+        dist2 = (delta ** 2).sum(axis=1)
+        inside = (rank[node] >= start) & (rank[node] < end)
+        far = ~inside & ((span / 2 ** level) ** 2 < theta ** 2 * dist2)
+        sources.append(node[far])
+        weights.append(mass[far] / dist2[far])
+        deltas.append(delta[far])
+
+        # Feuilles proches : interactions exactes avec chacun de leurs nœuds
+        near = ~far & leaf[cell]
+        position, owner = _expand(start[near], mass[near])
+        i, j = node[near][owner], order[position]
+        keep = i != j
+        i, j = i[keep], j[keep]
+        delta = pos[i] - pos[j]
+        sources.append(i)
+        weights.append(1 / np.maximum((delta ** 2).sum(axis=1), 1e-9))
+        deltas.append(delta)
+
+        opened = ~far & ~leaf[cell]
+        if not opened.any():
+            break
+        # Enfants d'une cellule : clés 4 * clé + quadrant, contiguës au niveau suivant
+        children = levels[level + 1][0]
+        parent = keys[cell[opened]]
+        first = np.searchsorted(children, 4 * parent)
+        counts = np.searchsorted(children, 4 * parent + 4) - first
+        cell, owner = _expand(first, counts)
+        node = node[opened][owner]
+
+    source, weight, delta = np.concatenate(sources), np.concatenate(weights), np.concatenate(deltas)
+    return k ** 2 * np.stack(
+        [np.bincount(source, weights=weight * delta[:, d], minlength=n) for d in range(2)], axis=1
+    )
+
+
+def force_directed_layout(n, edges, weights=None, iterations=200, seed=0):
+    """
+    Fruchterman-Reingold layout of n nodes, Barnes-Hut repulsion.
+    Attraction along each edge is scaled by its weight (e.g. |partial corr|).
+    Returns an (n, 2) array centred at the origin.
+    """
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n, 2))
+    if n < 2:
+        return pos * 0
+
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    weights = np.ones(len(edges)) if weights is None else np.abs(np.asarray(weights, dtype=float))
+    weights = weights / weights.max() if len(weights) and weights.max() > 0 else weights
+    k = np.sqrt(4.0 / n)
+    temperature = 0.1
+
+    for step in range(iterations):
+        force = barnes_hut_repulsion(pos, k)
+        delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+        dist = np.linalg.norm(delta, axis=1)
+        pull = (weights * dist / k)[:, None] * delta
+        np.add.at(force, edges[:, 0], -pull)
+        np.add.at(force, edges[:, 1], pull)
+
+        length = np.maximum(np.linalg.norm(force, axis=1), 1e-9)
+        cooling = temperature * (1 - step / iterations)
+        pos += force / length[:, None] * np.minimum(length, cooling)[:, None]
+
+    return pos - pos.mean(axis=0)
+
+
+def graph_hash(vertices, edges, weights=None, **params):
+    """
+    Stable key of a graph and its layout parameters.
+    """
+    weights = [None] * len(edges) if weights is None else [round(float(w), 6) for w in weights]
+    payload = {
+        "vertices": [str(v) for v in vertices],
+        "edges": sorted([str(u), str(v), w] for (u, v), w in zip(edges, weights)),
+        "params": params,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def cached_layout(vertices, edges, weights=None, scale=2.0, cache_dir=LAYOUT_CACHE_DIR, **params):
+    """
+    Layout dict {vertex: [x, y, 0]} for manim's Graph, fitted in a disk of
+    radius `scale`. Positions are read from the cache when the same graph
+    was laid out before.
+    """
+    vertices = list(vertices)
+    edges = [tuple(e) for e in edges]
+    key = graph_hash(vertices, edges, weights, **params)
+
+    if key in _memory_cache:
+        pos = _memory_cache[key]
+    else:
+        path = Path(cache_dir) / f"{key}.npy"
+        if path.exists():
+            pos = np.load(path)
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+            pairs = [(index[u], index[v]) for u, v in edges]
+            pos = force_directed_layout(len(vertices), pairs, weights, **params)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(path, pos)
+        _memory_cache[key] = pos
+
+    radius = np.linalg.norm(pos, axis=1).max()
+    pos = pos * (scale / radius) if radius > 0 else pos
+    return {v: np.array([x, y, 0.0]) for v, (x, y) in zip(vertices, pos)}
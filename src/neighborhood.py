@@ -0,0 +1,449 @@
+"""
+Neighborhood selection (Meinshausen & Bühlmann) by coordinate descent.
+
+Each node regression
+
+    theta^a = argmin_{theta : theta_a = 0} n^-1 ||X_a - X theta||_2^2 + lam ||theta||_1
+
+only depends on the data through the empirical covariance S = n^-1 X^T X,
+so the solvers below work on S and never touch X. For sparse data with a
+large p, `neighborhood_selection_sparse` works on X instead and costs
+O(nnz) per sweep; centering is always implicit, through the column means,
+so sparse matrices are never densified.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import blas
+
+
+def column_means(X):
+    """
+    Column means of a dense or sparse (n, p) data matrix, accumulated in float64.
+    """
+    return np.asarray(X.mean(axis=0, dtype=np.float64)).ravel()
+
+
+def empirical_covariance(X, dtype=np.float64, block=512):
+    """
+    Centered empirical covariance S = n^-1 X^T X of a (n, p) data matrix,
+    stored as `dtype`.
+
+    S is built tile by tile, so a float32 S never needs a float64 copy of X
+    or of S. Dense X is centered and multiplied in its own dtype: for
+    float32 data the tiles are plain sgemm products, whose error stays at
+    the level of rounding X to float32 in the first place. Sparse X is
+    centered implicitly, S = n^-1 X^T X - mu mu^T.
+    """
+    n, p = X.shape
+    mu = column_means(X)
+    is_sparse = sparse.issparse(X)
+    X = sparse.csc_matrix(X) if is_sparse else np.asarray(X)
+    if not is_sparse and X.dtype == np.float64 and dtype == np.float64:
+        centered = X - mu
+        return centered.T @ centered / n
+
+    # X float32 est centré en float32 : le produit des tuiles passe alors
+    # par sgemm, sans copie float64
+    work = np.float32 if X.dtype == np.float32 else np.float64
+
+    def columns(start, stop):
+        if is_sparse:
+            return X[:, start:stop].astype(np.float64)
+        return np.asarray(X[:, start:stop], dtype=work) - mu[start:stop].astype(work)
+
+    S = np.empty((p, p), dtype=dtype)
+    blocks = [(start, min(start + block, p)) for start in range(0, p, block)]
+    for i, (i0, i1) in enumerate(blocks):
+        left = columns(i0, i1)
+        for j0, j1 in blocks[i:]:
+            tile = left.T @ (left if j0 == i0 else columns(j0, j1))
+            if is_sparse:
+                tile = tile.toarray() / n - np.outer(mu[i0:i1], mu[j0:j1])
+            else:
+                tile /= n
+            S[i0:i1, j0:j1] = tile
+            if j0 != i0:
+                S[j0:j1, i0:i1] = tile.T
+    return S
+
+
+def soft_threshold(z, t):
+    """
+    Soft-thresholding operator sign(z) * max(|z| - t, 0).
+    """
+    return np.sign(z) * np.maximum(np.abs(z) - t, 0.0)
+
+
+def lambda_max(S):
+    """
+    Smallest lam for which every node regression is identically zero.
+    """
+    off_diagonal = np.abs(S - np.diag(np.diag(S)))
+    return 2 * off_diagonal.max()
+
+
+def lambda_max_sparse(X, block=512):
+    """
+    lambda_max of sparse data, computing S by column blocks so that only a
+    (p, block) slice is ever dense.
+    """
+    n, p = X.shape
+    X = sparse.csc_matrix(X)
+    mu = column_means(X)
+    top = 0.0
+    for start in range(0, p, block):
+        stop = min(start + block, p)
+        S_block = (X.T @ X[:, start:stop]).toarray() / n - np.outer(mu, mu[start:stop])
+        S_block[np.arange(start, stop), np.arange(stop - start)] = 0.0
+        top = max(top, np.abs(S_block).max())
+    return 2 * top
+
+
+def lambda_grid(S, num=40, ratio=0.05):
+    """
+    Decreasing geometric grid from lambda_max(S) down to ratio * lambda_max(S).
+    """
+    top = lambda_max(S)
+    return np.geomspace(top, top * ratio, num)
+
+
+def lasso_gram(G, c, lam, beta=None, exclude=None, tol=1e-8, max_iter=1000, diag=None, window=128):
+    """
+    Coordinate descent for min_beta beta^T G beta - 2 c^T beta + lam ||beta||_1.
+
+    The coordinate-wise minimiser is
+        beta_b = soft(c_b - sum_{k != b} G_bk beta_k, lam / 2) / G_bb.
+    Sweeps run over the active set until it is stable, then over all the
+    coordinates to check that no new variable enters. `beta` warm-starts,
+    coordinate `exclude` is held at zero. `diag`, the diagonal of G, can be
+    passed by callers that solve many problems on the same G.
+
+    A full sweep evaluates a window of coordinates at once with NumPy, and
+    only updates the first one that moves before evaluating again from the
+    next coordinate; the window starts at `window` and doubles while nothing
+    moves. It gives the same iterates as the coordinate loop without one
+    Python step per coordinate.
+
+    G may be stored in float32. The running gradient G beta then stays in
+    float32 too, so that each update reads and writes a float32 row with no
+    conversion, and steps below the float32 resolution of beta count as
+    converged; before each full sweep it is recomputed from beta with
+    float64 accumulation, which removes the drift of the float32 updates.
+    beta itself is always float64.
+    """
+    p = G.shape[0]
+    work = np.float32 if G.dtype == np.float32 else np.float64
+    beta = np.zeros(p) if beta is None else np.array(beta, dtype=np.float64)
+    if exclude is not None:
+        beta[exclude] = 0.0
+    c = np.asarray(c, dtype=np.float64)
+    diag = np.diag(G).astype(np.float64) if diag is None else diag
+
+    def exact_gradient():
+        nonzero = np.flatnonzero(beta)
+        return (beta[nonzero] @ np.asarray(G[nonzero], dtype=np.float64)).astype(work)
+
+    grad = exact_gradient()
+    axpy = blas.get_blas_funcs("axpy", dtype=work)
+    candidates = np.flatnonzero(diag > 0)
+    candidates = candidates[candidates != exclude]
+    half = lam / 2
+    # Le gradient float32 ne résout pas les pas sous sa précision relative
+    resolution = 4 * float(np.finfo(np.float32).eps) if work is np.float32 else 0.0
+    scale = float(np.abs(beta).max(initial=0.0))
+
+    def move(b, old, new):
+        nonlocal grad, delta, scale
+        # G est symétrique : la ligne b est contiguë, la colonne non ;
+        # saxpy / daxpy dans le dtype de G, sans conversion
+        grad = axpy(G[b], grad, a=new - old)
+        beta[b] = new
+        delta = max(delta, abs(new - old))
+        scale = max(scale, abs(new))
+
+    full_sweep = True
+    for _ in range(max_iter):
+        delta = 0.0
+        if full_sweep:
+            if work is np.float32:
+                # Le gradient float32 dérive : recalcul avant chaque balayage complet
+                grad = exact_gradient()
+            start, width = 0, window
+            while start < len(candidates):
+                block = candidates[start:start + width]
+                old = beta[block]
+                # Mêmes opérations float64 que la boucle scalaire
+                rho = c[block] - (grad[block] - diag[block] * old)
+                moved = np.flatnonzero(soft_threshold(rho, half) / diag[block] != old)
+                if len(moved) == 0:
+                    start += width
+                    width *= 2
+                    continue
+                # Seule la première coordonnée qui bouge est à jour : le
+                # gradient change après elle
+                k = moved[0]
+                rho_k = rho.item(k)
+                new = (rho_k - half if rho_k > half else rho_k + half if rho_k < -half else 0.0)
+                move(block.item(k), old.item(k), new / diag.item(block.item(k)))
+                start, width = start + k + 1, window
+            active = candidates[beta[candidates] != 0]
+        else:
+            # L'ensemble actif ne fait que se réduire entre deux balayages complets
+            active = active[beta[active] != 0]
+            # Scalaires Python dans la boucle : les scalaires NumPy y coûtent
+            # plus cher que la mise à jour de la ligne elle-même
+            for b, c_b, diag_b in zip(active.tolist(), c[active].tolist(), diag[active].tolist()):
+                old = beta.item(b)
+                rho = c_b - (grad.item(b) - diag_b * old)
+                new = (rho - half if rho > half else rho + half if rho < -half else 0.0) / diag_b
+                if new != old:
+                    move(b, old, new)
+        if delta < max(tol, resolution * scale):
+            if full_sweep:
+                break
+            full_sweep = True
+        else:
+            full_sweep = False
+    return beta
+
+
+def lasso_node(S, a, lam, theta=None, **kwargs):
+    """
+    Regression of node a on all the others, theta^a with theta^a_a = 0.
+    """
+    return lasso_gram(S, S[a], lam, theta, exclude=a, **kwargs)
+
+
+def neighborhood_selection(S, lam, coef=None, **kwargs):
+    """
+    Solve all p node regressions. Row a of the (p, p) result is theta^a,
+    stored with the dtype of S.
+    """
+    p = S.shape[0]
+    result = np.zeros((p, p), dtype=S.dtype)
+    # Diagonale lue une fois : en colonne, elle coûte un défaut de cache par élément
+    diag = np.diag(S).astype(np.float64)
+    for a in range(p):
+        result[a] = lasso_node(S, a, lam, None if coef is None else coef[a], diag=diag, **kwargs)
+    return result
+
+
+def neighborhood_path(S, lambdas, **kwargs):
+    """
+    Coefficients (len(lambdas), p, p) along a decreasing lam grid,
+    each fit warm-started from the previous one.
+    """
+    path = np.zeros((len(lambdas),) + S.shape, dtype=S.dtype)
+    coef = None
+    for k, lam in enumerate(lambdas):
+        coef = path[k] = neighborhood_selection(S, lam, coef, **kwargs)
+    return path
+
+
+def column_sq_norms(X, mu):
+    """
+    Squared norms of the centered columns of sparse X, in float64.
+    """
+    squares = X.power(2).sum(axis=0, dtype=np.float64)
+    return np.asarray(squares).ravel() - X.shape[0] * mu ** 2
+
+
+def lasso_node_sparse(X, a, lam, theta=None, mu=None, sq_norms=None,
+                      tol=1e-8, max_iter=1000):
+    """
+    Regression of node a on the columns of a sparse CSC matrix X.
+
+    The residual r = X_a - X theta is kept uncentered and dense; since the
+    columns of X - 1 mu^T sum to zero, the centered inner products are
+    x_b^T r - mu_b sum(r), and updating theta_b only touches the non-zeros
+    of column b. Same coordinate updates and active-set sweeps as lasso_gram.
+    X may be float32; the residual and the inner products are float64.
+    """
+    n, p = X.shape
+    X = sparse.csc_matrix(X)
+    mu = column_means(X) if mu is None else mu
+    sq_norms = column_sq_norms(X, mu) if sq_norms is None else sq_norms
+    diag = sq_norms / n
+    theta = np.zeros(p) if theta is None else np.array(theta, dtype=float)
+    theta[a] = 0.0
+
+    residual = X[:, a].toarray().ravel().astype(np.float64) - X @ theta
+    residual_sum = residual.sum()
+    candidates = np.flatnonzero(diag > 0)
+    candidates = candidates[candidates != a]
+    # Scalaires Python dans la boucle, comme dans lasso_gram
+    mu_list, diag_list, indptr, half = mu.tolist(), diag.tolist(), X.indptr.tolist(), lam / 2
+
+    full_sweep = True
+    for _ in range(max_iter):
+        coords = candidates if full_sweep else candidates[theta[candidates] != 0]
+        delta = 0.0
+        for b in coords.tolist():
+            start, end = indptr[b], indptr[b + 1]
+            rows = X.indices[start:end]
+            values = X.data[start:end].astype(np.float64)
+            old = theta.item(b)
+            rho = float(values @ residual[rows] - mu_list[b] * residual_sum) / n + diag_list[b] * old
+            new = (rho - half if rho > half else rho + half if rho < -half else 0.0) / diag_list[b]
+            if new != old:
+                residual[rows] -= (new - old) * values
+                residual_sum -= (new - old) * n * mu_list[b]
+                theta[b] = new
+                delta = max(delta, abs(new - old))
+        if delta < tol:
+            if full_sweep:
+                break
+            full_sweep = True
+        else:
+            full_sweep = False
+    return theta
+
+
+def neighborhood_selection_sparse(X, lam, nodes=None, coef=None, **kwargs):
+    """
+    Node regressions straight from sparse data, without forming S.
+    Returns the rows theta^a for `nodes` (all of them by default).
+    """
+    n, p = X.shape
+    X = sparse.csc_matrix(X)
+    mu = column_means(X)
+    sq_norms = column_sq_norms(X, mu)
+    nodes = range(p) if nodes is None else nodes
+    return np.array([
+        lasso_node_sparse(X, a, lam, None if coef is None else coef[i], mu, sq_norms, **kwargs)
+        for i, a in enumerate(nodes)
+    ])
+
+
+########################################################################
+### Petits problèmes en lot ############################################
+########################################################################
+
+def batched_lasso_gram(G, c, lam, free=None, gram_index=None, tol=1e-8, max_iter=1000):
+    """
+    Solve M small problems min beta^T G_k beta - 2 c_m^T beta + lam_m ||beta||_1
+    in lockstep, vectorised over the problems.
+
+    G is (K, p, p) and problem m uses G[gram_index[m]] (default: K == M);
+    c is (M, p), lam a scalar or (M,), free an optional (M, p) mask of the
+    coordinates allowed to move. Each problem keeps its own active set, a
+    row of an (M, p) mask: a sweep visits the coordinates active in at least
+    one live problem and updates, for each, every live problem where it is
+    active. A problem whose sweep is stable gets a KKT check,
+    |c_b - (G beta)_b| <= lam / 2 for its zero coordinates, vectorised over
+    all such problems: the violators join its active set, or it leaves the
+    live set if there are none.
+    """
+    M, p = c.shape
+    c = np.asarray(c, dtype=np.float64)
+    gram_index = np.arange(M) if gram_index is None else np.asarray(gram_index)
+    lam = np.broadcast_to(np.asarray(lam, dtype=np.float64), (M,))
+    free = np.ones((M, p), dtype=bool) if free is None else free
+    diag = np.diagonal(G, axis1=1, axis2=2).astype(np.float64)
+    allowed = free & (diag[gram_index] > 0)
+
+    beta = np.zeros((M, p))
+    grad = np.zeros((M, p))
+    active = np.zeros((M, p), dtype=bool)
+    live = np.arange(M)
+    for _ in range(max_iter):
+        # Copies compactes des problèmes vivants pour la durée du balayage
+        gram = gram_index[live]
+        B, R, C, D = beta[live], grad[live], c[live], diag[gram]
+        half = lam[live] / 2
+        members = active[live]
+        delta = np.zeros(len(live))
+        for b in np.flatnonzero(members.any(axis=0)):
+            local = np.flatnonzero(members[:, b])
+            # Coordonnée active partout : tranches au lieu d'indices
+            rows = slice(None) if len(local) == len(live) else local
+            old = B[rows, b]
+            rho = C[rows, b] - (R[rows, b] - D[rows, b] * old)
+            new = soft_threshold(rho, half[rows]) / D[rows, b]
+            step = new - old
+            R[rows] += step[:, None] * G[gram[rows], b, :]
+            B[rows, b] = new
+            delta[rows] = np.maximum(delta[rows], np.abs(step))
+        beta[live], grad[live] = B, R
+
+        # Contrôle KKT groupé après chaque balayage : les violations entrent
+        # tout de suite dans l'ensemble actif
+        violators = (allowed[live] & (B == 0)) & (np.abs(C - R) > half[:, None])
+        active[live] = (B != 0) | violators
+        live = live[(delta >= tol) | violators.any(axis=1)]
+        if len(live) == 0:
+            break
+    return beta
+
+
+def batched_neighborhood_selection(S, lam, **kwargs):
+    """
+    Neighborhood selection on a stack of K small covariances (K, p, p), e.g.
+    Monte Carlo replicates or subsample refits. Returns (K, p, p) with
+    coef[k, a] = theta^a for S[k]; all the K * p regressions run in lockstep.
+    """
+    K, p, _ = S.shape
+    gram_index = np.repeat(np.arange(K), p)
+    c = S.reshape(K * p, p)
+    free = ~np.tile(np.eye(p, dtype=bool), (K, 1))
+    return batched_lasso_gram(S, c, lam, free, gram_index, **kwargs).reshape(K, p, p)
+
+
+def adjacency(coef, rule="and"):
+    """
+    Boolean adjacency of the estimated graph: E^and needs theta^a_b != 0 and
+    theta^b_a != 0, E^or needs only one of them.
+    """
+    nonzero = coef != 0
+    if rule == "and":
+        graph = nonzero & nonzero.T
+    elif rule == "or":
+        graph = nonzero | nonzero.T
+    else:
+        raise ValueError(f"Unknown rule {rule!r}, expected 'and' or 'or'")
+    np.fill_diagonal(graph, False)
+    return graph
+
+
+def edge_list(coef, rule="and"):
+    """
+    Sorted list of undirected edges (i, j), i < j.
+    """
+    rows, cols = np.nonzero(np.triu(adjacency(coef, rule), k=1))
+    return list(zip(rows.tolist(), cols.tolist()))
+
+
+########################################################################
+### Données simulées ###################################################
+########################################################################
+
+# Graphe d'exemple de LassoNeighborhood, construit voisinage par voisinage
+NEIGHBORHOOD_EDGES = [
+    (0, 1), (0, 2), (0, 4), (0, 6),
+    (1, 2), (1, 3), (1, 6),
+    (2, 4), (2, 5), (2, 7),
+    (3, 6), (7, 5), (6, 4),
+]
+
+
+def precision_from_edges(p, edges, strength=0.3):
+    """
+    Positive definite precision matrix with non-zeros exactly on `edges`.
+    """
+    omega = np.eye(p)
+    for i, j in edges:
+        omega[i, j] = omega[j, i] = strength
+    smallest = np.linalg.eigvalsh(omega)[0]
+    if smallest < 0.1:
+        omega += (0.1 - smallest) * np.eye(p)
+    return omega
+
+
+def sample_gaussian(omega, n, seed=0):
+    """
+    n samples of N(0, omega^-1).
+    """
+    rng = np.random.default_rng(seed)
+    sigma = np.linalg.inv(omega)
+    return rng.multivariate_normal(np.zeros(len(omega)), sigma, size=n)
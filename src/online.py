@@ -0,0 +1,187 @@
+"""
+Online neighborhood selection for data arriving in batches.
+
+The state is the MLE of Partie1Scene kept as mergeable sufficient
+statistics: n, mu_hat, the scatter matrix n Sigma_hat and the fourth
+moments used by the Ledoit-Wolf shrinkage (see shrinkage.py). A new batch
+is folded in with the pairwise (Chan et al.) update, then only the node
+regressions whose KKT conditions are violated by the new Sigma_hat are
+solved again, warm-started from their previous coefficients.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from neighborhood import adjacency, column_means, empirical_covariance, lasso_node
+
+
+class SufficientStats:
+    """
+    Running n, mean and scatter sum_i (x_i - mu)(x_i - mu)^T, plus the
+    fourth moments sum_i ||x_i - mu||^4 and sum_i ||x_i - mu||^2 (x_i - mu).
+    The fourth moments are None when unknown (state saved without them).
+
+    While n < p the centred rows x_i - mu are kept too, a rank n factor of
+    the scatter that shrinkage.py inverts without factoring a p x p matrix;
+    they are dropped (None) once n reaches p.
+    """
+
+    def __init__(self, p, dtype=np.float64):
+        self.n = 0
+        self.mean = np.zeros(p)
+        self.scatter = np.zeros((p, p), dtype=dtype)
+        self.fourth = 0.0
+        self.third = np.zeros(p)
+        self.rows = np.zeros((0, p), dtype=dtype)
+
+    @classmethod
+    def from_batch(cls, X, dtype=np.float64):
+        stats = cls(X.shape[1], dtype)
+        stats.n = X.shape[0]
+        stats.mean = column_means(X)
+        stats.scatter = empirical_covariance(X, dtype=dtype) * stats.n
+        # ||x_i - mu||^2 sans centrer X, qui peut être creuse
+        if sparse.issparse(X):
+            sq = np.asarray(X.multiply(X).sum(axis=1, dtype=np.float64)).ravel()
+        else:
+            sq = np.einsum("ij,ij->i", X, X, dtype=np.float64)
+        sq += stats.mean @ stats.mean - 2 * np.asarray(X @ stats.mean, dtype=np.float64).ravel()
+        stats.fourth = float(sq @ sq)
+        stats.third = np.asarray(X.T @ sq, dtype=np.float64).ravel() - sq.sum() * stats.mean
+        if stats.n < X.shape[1]:
+            # n < p : n lignes denses, moins que la matrice de dispersion
+            dense = X.toarray() if sparse.issparse(X) else X
+            stats.rows = (dense - stats.mean).astype(dtype)
+        else:
+            stats.rows = None
+        return stats
+
+    def _shift(self, d):
+        """
+        Fourth moments about mean + d instead of mean.
+        """
+        c = d @ d
+        scatter_d = np.asarray(self.scatter @ d, dtype=np.float64)
+        trace = np.trace(self.scatter, dtype=np.float64)
+        fourth = self.fourth - 4 * self.third @ d + 4 * d @ scatter_d + 2 * c * trace + self.n * c**2
+        third = self.third - (trace + self.n * c) * d - 2 * scatter_d
+        return fourth, third
+
+    def merge(self, other):
+        """
+        Fold `other` into this state, as if both batches had been seen at once.
+        """
+        if other.n == 0:
+            return self
+        total = self.n + other.n
+        delta = other.mean - self.mean
+        if self.fourth is None or other.fourth is None:
+            self.fourth = self.third = None
+        else:
+            mine, theirs = self._shift(delta * (other.n / total)), other._shift(-delta * (self.n / total))
+            self.fourth = mine[0] + theirs[0]
+            self.third = mine[1] + theirs[1]
+        if self.rows is None or other.rows is None or total >= len(self.mean):
+            self.rows = None
+        else:
+            # Lignes recentrées sur la moyenne commune
+            self.rows = np.vstack([
+                self.rows - (delta * (other.n / total)).astype(self.rows.dtype),
+                other.rows + (delta * (self.n / total)).astype(self.rows.dtype),
+            ])
+        self.scatter += other.scatter
+        self.scatter += np.outer(delta, delta * (self.n * other.n / total)).astype(self.scatter.dtype)
+        self.mean += delta * (other.n / total)
+        self.n = total
+        return self
+
+    def update(self, X):
+        """
+        Fold a (n_batch, p) batch, dense or sparse. Costs O(n_batch p^2).
+        """
+        return self.merge(SufficientStats.from_batch(X, self.scatter.dtype))
+
+    def covariance(self):
+        """
+        Sigma_hat = n^-1 sum_i (x_i - mu_hat)(x_i - mu_hat)^T.
+        """
+        return self.scatter / self.n
+
+    def save(self, path):
+        optional = {} if self.fourth is None else {"fourth": self.fourth, "third": self.third}
+        if self.rows is not None:
+            optional["rows"] = self.rows
+        np.savez(path, n=self.n, mean=self.mean, scatter=self.scatter, **optional)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as state:
+            stats = cls(len(state["mean"]), state["scatter"].dtype)
+            stats.n = int(state["n"])
+            stats.mean = state["mean"]
+            stats.scatter = state["scatter"]
+            # Ancien état sans moments d'ordre 4 : inconnus, pas nuls
+            if "fourth" in state.files:
+                stats.fourth = float(state["fourth"])
+                stats.third = state["third"]
+            else:
+                stats.fourth = stats.third = None
+            stats.rows = state["rows"] if "rows" in state.files else None
+        return stats
+
+
+def kkt_violations(S, coef, lam, tol=1e-3):
+    """
+    Nodes a whose support would change under S, with a margin of tol * lam.
+
+    With r^a = S_a - S theta^a, a zero theta^a_b enters the support once
+    |r^a_b| > lam / 2, and a non-zero one leaves it or flips sign once a
+    coordinate step, soft(r^a_b + S_bb theta^a_b, lam / 2) / S_bb, no longer
+    has its sign. Small drift in active coefficients is left for the next
+    time the node is solved. The products use the sparse coefficients,
+    O(nnz(coef) p).
+    """
+    residual = S - sparse.csr_matrix(coef) @ S
+    sign = np.sign(coef)
+    enters = np.abs(residual) - lam / 2
+    leaves = lam / 2 - sign * (residual + coef * np.diagonal(S))
+    bound = np.where(sign != 0, leaves, enters)
+    np.fill_diagonal(bound, 0)
+    return np.flatnonzero((bound > tol * lam).any(axis=1))
+
+
+class OnlineNeighborhood:
+    """
+    Neighborhood selection kept up to date as batches arrive.
+    """
+
+    def __init__(self, lam, rule="and", stats=None, coef=None, tol=1e-3):
+        self.lam = lam
+        self.rule = rule
+        self.tol = tol
+        self.stats = stats
+        self.coef = coef
+
+    def update(self, X, **kwargs):
+        """
+        Fold a batch, re-solve the violating nodes and return
+        (added, removed, resolved): changed edges and re-solved nodes.
+        """
+        if self.stats is None:
+            self.stats = SufficientStats.from_batch(X)
+        else:
+            self.stats.update(X)
+        S = self.stats.covariance()
+        p = S.shape[0]
+        if self.coef is None:
+            self.coef = np.zeros((p, p), dtype=S.dtype)
+        before = adjacency(self.coef, self.rule)
+
+        resolved = kkt_violations(S, self.coef, self.lam, self.tol)
+        for a in resolved:
+            self.coef[a] = lasso_node(S, a, self.lam, self.coef[a], **kwargs)
+
+        after = adjacency(self.coef, self.rule)
+        added = np.argwhere(np.triu(after & ~before, k=1))
+        removed = np.argwhere(np.triu(before & ~after, k=1))
+        return [tuple(e) for e in added.tolist()], [tuple(e) for e in removed.tolist()], resolved
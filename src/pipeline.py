@@ -0,0 +1,297 @@
+"""
+Command-line pipeline: data matrix -> fitted graph -> rendered scenes.
+
+    python src/pipeline.py fit data.csv --lam 0.1 --jobs 4 --out media/fits/genes
+    python src/pipeline.py render media/fits/genes -q l IntroScene LassoNeighborhood
+
+The two stages are independent. `fit` checkpoints the node regressions
+chunk by chunk and is skipped when its artifact is already up to date, so
+a visual tweak only reruns `render`.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from scipy import io, sparse
+
+from artifact import ARTIFACT_ENV, load_artifact, save_artifact
+from glasso import graphical_lasso
+from neighborhood import (
+    edge_list,
+    lambda_max,
+    lambda_max_sparse,
+    lasso_node,
+    neighborhood_selection_sparse,
+)
+from online import OnlineNeighborhood, SufficientStats
+from refit import partial_correlations, refit_precision
+
+
+SRC = Path(__file__).resolve().parent
+SCENES = {
+    "IntroScene": SRC / "intro.py",
+    "LassoNeighborhood": SRC / "algo.py",
+}
+
+
+def load_data(path, delimiter=","):
+    """
+    (X, names) from a .npy file, a sparse .npz / Matrix Market .mtx file
+    (kept sparse, as CSC) or a delimited text file with an optional header.
+    """
+    path = Path(path)
+    if path.suffix in (".npy", ".npz", ".mtx"):
+        if path.suffix == ".npy":
+            X = np.load(path)
+        elif path.suffix == ".npz":
+            X = sparse.load_npz(path).tocsc()
+        else:
+            X = sparse.csc_matrix(io.mmread(path))
+        return X, [f"X{j}" for j in range(X.shape[1])]
+    with open(path) as f:
+        first = [v.strip() for v in f.readline().split(delimiter)]
+    try:
+        [float(v) for v in first]
+        header = None
+    except ValueError:
+        header = first
+    X = np.loadtxt(path, delimiter=delimiter, skiprows=1 if header else 0, ndmin=2)
+    return X, header or [f"X{j}" for j in range(X.shape[1])]
+
+
+def file_digest(path):
+    """
+    SHA-1 of a file, used to detect a changed input.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+########################################################################
+### Ajustement #########################################################
+########################################################################
+
+_worker_data = None
+
+
+def _init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+
+def _solve_chunk(nodes, lam):
+    if sparse.issparse(_worker_data):
+        return neighborhood_selection_sparse(_worker_data, lam, nodes)
+    diag = np.diag(_worker_data).astype(np.float64)
+    return np.array([lasso_node(_worker_data, a, lam, diag=diag) for a in nodes])
+
+
+def fit_neighborhoods(data, lam, jobs=1, chunk_size=64, checkpoint=None):
+    """
+    All node regressions, `jobs` processes in parallel. `data` is either the
+    covariance S or sparse (n, p) data, which is then never densified.
+    Finished chunks are saved to `checkpoint` and reloaded instead of
+    recomputed.
+    """
+    p = data.shape[1]
+    chunks = [range(start, min(start + chunk_size, p)) for start in range(0, p, chunk_size)]
+    coef = np.zeros((p, p), dtype=data.dtype)
+    todo = []
+    for k, nodes in enumerate(chunks):
+        path = checkpoint / f"chunk_{k:05d}.npy" if checkpoint else None
+        if path and path.exists():
+            coef[nodes.start:nodes.stop] = np.load(path)
+        else:
+            todo.append((k, nodes, path))
+
+    def store(nodes, path, rows):
+        coef[nodes.start:nodes.stop] = rows
+        if path:
+            np.save(path, rows)
+
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = {pool.submit(_solve_chunk, nodes, lam): (nodes, path) for _, nodes, path in todo}
+            for future in as_completed(futures):
+                store(*futures[future], future.result())
+    else:
+        _init_worker(data)
+        for _, nodes, path in todo:
+            store(nodes, path, _solve_chunk(nodes, lam))
+    return coef
+
+
+def refit_arrays(data, edges):
+    """
+    Constrained MLE of Omega on `edges`, stored as its diagonal, its values
+    on the edges and the partial correlations (both in edge order).
+    """
+    omega = refit_precision(data, edges)
+    pairs = np.array(edges, dtype=int).reshape(-1, 2)
+    return {
+        "refit_diag": omega.diagonal(),
+        "refit_offdiag": np.asarray(omega[pairs[:, 0], pairs[:, 1]]).ravel(),
+        "partial_correlation": partial_correlations(omega, edges),
+    }
+
+
+def fit(args):
+    dtype = np.float32 if args.float32 else np.float64
+    out = Path(args.out)
+    # Avec --lam-ratio, le lambda résolu dépend des données : c'est le
+    # rapport qui identifie la demande
+    params = {
+        "method": args.method,
+        "lam_ratio": None if args.lam is not None else args.lam_ratio,
+        "rule": args.rule,
+        "refit": args.refit,
+        "dtype": np.dtype(dtype).name,
+        "source": str(Path(args.data).resolve()),
+        "source_sha1": file_digest(args.data),
+    }
+
+    # Vérifié avant de charger les données et de calculer S
+    if (out / "graph.json").exists() and not args.force:
+        with open(out / "graph.json") as f:
+            previous = json.load(f)
+        updated = previous.get("batches")
+        same_lam = args.lam is None or previous.get("lam") == args.lam
+        if not updated and same_lam and all(previous.get(k) == v for k, v in params.items()):
+            print(f"{out} est à jour, rien à recalculer (--force pour refaire)")
+            return
+
+    X, names = load_data(args.data, args.delimiter)
+    X = X.astype(dtype, copy=False)
+    # Données creuses : pas de matrice S dense pour le voisinage
+    data_path = sparse.issparse(X) and args.method == "neighborhood"
+    stats = None if data_path else SufficientStats.from_batch(X, dtype)
+    S = None if data_path else stats.covariance()
+    if args.lam is not None:
+        lam = args.lam
+    else:
+        lam = float(args.lam_ratio * (lambda_max_sparse(X) if data_path else lambda_max(S)))
+
+    # Les coefficients ne dépendent ni de la règle ni du refit ; les fichiers
+    # de chunk sont indexés par numéro : la taille fait partie de la clé
+    checkpoint_params = {
+        **{k: v for k, v in params.items() if k not in ("rule", "refit")},
+        "lam": lam,
+        "chunk_size": args.chunk_size,
+    }
+    key = hashlib.sha1(json.dumps(checkpoint_params, sort_keys=True).encode()).hexdigest()[:12]
+    checkpoint = out / "chunks" / key
+    arrays = {}
+    if args.method == "neighborhood":
+        checkpoint.mkdir(parents=True, exist_ok=True)
+        coef = fit_neighborhoods(X if data_path else S, lam, args.jobs, args.chunk_size, checkpoint)
+        edges = edge_list(coef, args.rule)
+        if args.refit:
+            arrays.update(refit_arrays(X if data_path else S, edges))
+    else:
+        omega, _ = graphical_lasso(S.astype(np.float64), lam)
+        # theta^a_b = -Omega_ab / Omega_aa
+        coef = -omega / np.diag(omega)[:, None]
+        np.fill_diagonal(coef, 0)
+        edges = edge_list(omega - np.diag(np.diag(omega)), "and")
+        arrays["precision"] = omega
+
+    meta = {**params, "lam": lam, "n": X.shape[0], "p": X.shape[1], "names": names}
+    save_artifact(out, meta, edges, coef=coef, **arrays)
+    if stats is not None:
+        stats.save(out / "state.npz")
+    shutil.rmtree(out / "chunks", ignore_errors=True)
+    print(f"{len(edges)} arêtes, p={X.shape[1]}, lambda={lam:.4g} -> {out}")
+
+
+def update(args):
+    out = Path(args.artifact)
+    fit = load_artifact(out)
+    if fit["method"] != "neighborhood" or not (out / "state.npz").exists():
+        raise SystemExit(f"{out} n'a pas d'état en ligne (voisinage, données denses seulement)")
+    stats = SufficientStats.load(out / "state.npz")
+    X, _ = load_data(args.batch, args.delimiter)
+    coef = fit["coef"].astype(stats.scatter.dtype)
+    model = OnlineNeighborhood(fit["lam"], fit["rule"], stats, coef, tol=args.tol)
+    added, removed, resolved = model.update(X.astype(stats.scatter.dtype, copy=False))
+
+    names = fit["names"]
+    keep = ("method", "lam", "lam_ratio", "rule", "refit", "dtype",
+            "source", "source_sha1", "names", "p")
+    meta = {k: fit[k] for k in keep if k in fit}
+    meta.update(n=stats.n, batches=fit.get("batches", []) + [file_digest(args.batch)])
+    edges = edge_list(model.coef, model.rule)
+    arrays = refit_arrays(stats.covariance(), edges) if fit.get("refit") else {}
+    save_artifact(out, meta, edges, coef=model.coef, **arrays)
+    stats.save(out / "state.npz")
+    print(f"n={stats.n}, {len(resolved)} noeuds recalculés")
+    for sign, edges in (("+", added), ("-", removed)):
+        for i, j in edges:
+            print(f"  {sign} {names[i]} -- {names[j]}")
+
+
+########################################################################
+### Rendu ##############################################################
+########################################################################
+
+def render(args):
+    env = {**os.environ, ARTIFACT_ENV: str(Path(args.artifact).resolve())}
+    for scene in args.scenes:
+        command = ["manim", f"-q{args.quality}", str(SCENES[scene]), scene]
+        if args.preview:
+            command.insert(1, "-p")
+        subprocess.run(command, env=env, check=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    stages = parser.add_subparsers(dest="stage", required=True)
+
+    fit_parser = stages.add_parser("fit", help="estimate the graph and write the artifact")
+    fit_parser.add_argument("data", help="(n, p) data matrix: .csv/.txt, .npy, or sparse .npz/.mtx")
+    fit_parser.add_argument("--out", required=True, help="artifact directory")
+    fit_parser.add_argument("--method", choices=["neighborhood", "glasso"], default="neighborhood")
+    fit_parser.add_argument("--lam", type=float, help="penalty (default: --lam-ratio * lambda_max)")
+    fit_parser.add_argument("--lam-ratio", type=float, default=0.1)
+    fit_parser.add_argument("--rule", choices=["and", "or"], default="and")
+    fit_parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    fit_parser.add_argument("--chunk-size", type=int, default=64)
+    fit_parser.add_argument("--refit", action="store_true",
+                            help="also store the MLE of Omega constrained to the selected graph")
+    fit_parser.add_argument("--float32", action="store_true",
+                            help="store X, S and coefficients in float32 (float64 accumulation)")
+    fit_parser.add_argument("--delimiter", default=",")
+    fit_parser.add_argument("--force", action="store_true")
+    fit_parser.set_defaults(run=fit)
+
+    update_parser = stages.add_parser("update", help="fold a new batch into a neighborhood fit")
+    update_parser.add_argument("artifact", help="artifact directory written by fit")
+    update_parser.add_argument("batch", help="(n_batch, p) data matrix, same formats as fit")
+    update_parser.add_argument("--delimiter", default=",")
+    update_parser.add_argument("--tol", type=float, default=1e-3,
+                               help="KKT margin, in units of lambda, before a node is re-solved")
+    update_parser.set_defaults(run=update)
+
+    render_parser = stages.add_parser("render", help="render scenes from an artifact")
+    render_parser.add_argument("artifact", help="artifact directory written by fit")
+    render_parser.add_argument("scenes", nargs="+", choices=sorted(SCENES))
+    render_parser.add_argument("-q", "--quality", choices=list("lmhpk"), default="l")
+    render_parser.add_argument("-p", "--preview", action="store_true")
+    render_parser.set_defaults(run=render)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Opt-in render profiler for our scenes.
+
+Run any scene through this module instead of the manim command:
+
+    python src/profiling.py -ql src/intro.py IntroScene
+
+Every `self.play` / `self.wait` call and every construction phase between
+them is recorded with its wall time, the time spent inside LaTeX, Pango,
+frame rasterisation and encoding, and the process memory. Events are
+labelled with the nearest section comment above the call in the scene
+source ("### Lasso Halo ###", "# --- 3) Tableau ... ---").
+
+Two files per scene are written to media/profiles/ (or $MANIM_PROFILE_DIR):
+<Scene>.csv, sorted by wall time, and <Scene>.folded, in the folded-stack
+format read by flamegraph.pl and speedscope.
+"""
+
+import csv
+import functools
+import linecache
+import os
+import re
+import resource
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+PROFILE_DIR = Path(os.environ.get("MANIM_PROFILE_DIR", Path("media") / "profiles"))
+CATEGORIES = ("latex", "pango", "raster", "encode")
+
+# "### Titre ####" ou "# --- Titre ---"
+_SECTION = re.compile(r"^(?:#{3,}|#\s*-{3})\s*(.*?)\s*[#-]*$")
+
+
+def _rss_mb():
+    """
+    Current resident set size in MB (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@functools.lru_cache(maxsize=None)
+def section_label(filename, lineno):
+    """
+    Title of the nearest section comment above `lineno`.
+    """
+    for line in range(lineno - 1, 0, -1):
+        match = _SECTION.match(linecache.getline(filename, line).strip())
+        if match and match.group(1):
+            return match.group(1)
+    return "<début>"
+
+
+class RenderProfiler:
+    """
+    Collects timed events for one scene render.
+    """
+
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.events = []
+        self.inside = defaultdict(float)
+        self.mark = time.perf_counter()
+        self.section = "<début>"
+
+    def record(self, kind, location, detail, start):
+        """
+        Close the event that started at `start` and reset the category timers.
+        """
+        now = time.perf_counter()
+        rss = _rss_mb()
+        previous = self.events[-1]["rss_mb"] if self.events else rss
+        self.events.append({
+            "index": len(self.events),
+            "kind": kind,
+            "section": self.section,
+            "line": location,
+            "detail": detail,
+            "wall_s": now - start,
+            **{f"{c}_s": self.inside.pop(c, 0.0) for c in CATEGORIES},
+            "rss_mb": rss,
+            "rss_delta_mb": rss - previous,
+        })
+        self.mark = now
+
+    def write(self, directory=PROFILE_DIR):
+        """
+        Write <scene>.csv (slowest first) and <scene>.folded.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = sorted(self.events, key=lambda e: e["wall_s"], reverse=True)
+        with open(directory / f"{self.scene_name}.csv", "w", newline="") as report:
+            writer = csv.DictWriter(report, fieldnames=list(self.events[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        with open(directory / f"{self.scene_name}.folded", "w") as folded:
+            for e in self.events:
+                frame = f"{e['kind']} L{e['line']} {e['detail']}".strip().replace(";", ",")
+                stack = f"{self.scene_name};{e['section']};{frame}"
+                other = e["wall_s"] - sum(e[f"{c}_s"] for c in CATEGORIES)
+                for c in CATEGORIES:
+                    if e[f"{c}_s"] > 0:
+                        folded.write(f"{stack};{c} {int(e[f'{c}_s'] * 1e6)}\n")
+                folded.write(f"{stack} {int(max(other, 0) * 1e6)}\n")
+        return rows
+
+
+_current = None
+
+
+def _timed(category, function):
+    """
+    Accumulate the time spent in `function` into the current event.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _current is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current.inside[category] += time.perf_counter() - start
+    return wrapper
+
+
+def outermost(hook):
+    """
+    Wrapper factory for Scene.play / Scene.wait. Outermost calls go to
+    `hook(kind, scene, call, (filename, lineno), args)`, where `call()` runs
+    the original method and the location is the scene code that made the
+    call. Nested calls, such as the Scene.play run by Scene.wait, run the
+    original method directly. Methods wrapped by the same factory share one
+    depth counter.
+    """
+    depth = 0
+
+    def wrap(kind, method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            nonlocal depth
+            if depth:
+                return method(self, *args, **kwargs)
+            caller = sys._getframe(1)
+            location = caller.f_code.co_filename, caller.f_lineno
+            depth += 1
+            try:
+                return hook(kind, self, lambda: method(self, *args, **kwargs), location, args)
+            finally:
+                depth -= 1
+        return wrapper
+    return wrap
+
+
+def install():
+    """
+    Patch manim so that every scene rendered afterwards is profiled.
+    """
+    from manim import Scene
+    from manim.mobject.text import tex_mobject, text_mobject
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    tex_mobject.tex_to_svg_file = _timed("latex", tex_mobject.tex_to_svg_file)
+    text_mobject.Text._text2svg = _timed("pango", text_mobject.Text._text2svg)
+    text_mobject.MarkupText._text2svg = _timed("pango", text_mobject.MarkupText._text2svg)
+    CairoRenderer.update_frame = _timed("raster", CairoRenderer.update_frame)
+    SceneFileWriter.write_frame = _timed("encode", SceneFileWriter.write_frame)
+    SceneFileWriter.combine_to_movie = _timed("encode", SceneFileWriter.combine_to_movie)
+
+    def profiled(kind, scene, call, location, args):
+        if _current is None:
+            return call()
+        filename, lineno = location
+        _current.section = section_label(filename, lineno)
+        _current.record("construct", lineno, "", _current.mark)
+        detail = " ".join(type(a).__name__ for a in args) if kind == "play" else ""
+        start = time.perf_counter()
+        result = call()
+        _current.record(kind, lineno, detail, start)
+        return result
+
+    original_render = Scene.render
+
+    @functools.wraps(original_render)
+    def render(self, *args, **kwargs):
+        global _current
+        _current = RenderProfiler(type(self).__name__)
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            _current.record("finish", "", "", _current.mark)
+            rows = _current.write()
+            _current = None
+            print(f"\nProfil {type(self).__name__} -> {PROFILE_DIR}")
+            for e in rows[:10]:
+                print(f"{e['wall_s']:8.2f}s  {e['kind']:<9} L{e['line']:<5} {e['section']}")
+
+    wrap = outermost(profiled)
+    Scene.play = wrap("play", Scene.play)
+    Scene.wait = wrap("wait", Scene.wait)
+    Scene.render = render
+
+
+if __name__ == "__main__":
+    from manim.__main__ import main
+
+    install()
+    sys.argv = ["manim", *sys.argv[1:]]
+    main()
@@ -0,0 +1,107 @@
+"""
+Shrinkage baselines for Omega when Sigma_hat is not invertible.
+
+Both estimators pull the empirical covariance towards a scaled identity,
+
+    Sigma_delta = (1 - delta) Sigma_hat + delta mu I,    mu = tr(Sigma_hat) / p,
+
+with a closed-form intensity delta: Ledoit & Wolf (2004), or the
+Oracle-Approximating Shrinkage of Chen et al. (2010). delta only needs the
+streaming sufficient statistics of online.py. Sigma_delta is invertible for
+any delta > 0; when n < p it is a diagonal plus a rank n correction, and
+`shrunk_precision` inverts it with the Woodbury identity in O(n^2 p), from
+the centred rows kept by the statistics, and returns Omega_delta in the
+same diagonal plus low rank form instead of a dense p x p matrix.
+"""
+
+import numpy as np
+from scipy import linalg
+
+
+def ledoit_wolf(stats):
+    """
+    (delta, mu) of the Ledoit-Wolf estimator.
+
+    delta = min(b^2, d^2) / d^2 with d^2 = ||Sigma_hat - mu I||_F^2 / p and
+    b^2 = (n^-1 sum_i ||x_i - mu_hat||^4 - ||Sigma_hat||_F^2) / (n p).
+    Raises ValueError when `stats` has no fourth moments; `oas` does not
+    need them.
+    """
+    if stats.fourth is None:
+        raise ValueError("Ledoit-Wolf needs the fourth moments, absent from this state; use oas")
+    n, p = stats.n, len(stats.mean)
+    S = stats.covariance()
+    mu = np.trace(S, dtype=np.float64) / p
+    frobenius = np.einsum("ij,ij->", S, S, dtype=np.float64)
+    d2 = (frobenius - p * mu**2) / p
+    b2 = (stats.fourth / n - frobenius) / (n * p)
+    return (min(b2, d2) / d2 if d2 > 0 else 1.0), mu
+
+
+def oas(stats):
+    """
+    (delta, mu) of the Oracle-Approximating Shrinkage estimator.
+    """
+    n, p = stats.n, len(stats.mean)
+    S = stats.covariance()
+    mu = np.trace(S, dtype=np.float64) / p
+    alpha = np.einsum("ij,ij->", S, S, dtype=np.float64) / p**2
+    denominator = (n + 1) * (alpha - mu**2 / p)
+    return (min((alpha + mu**2) / denominator, 1.0) if denominator > 0 else 1.0), mu
+
+
+def shrunk_covariance(stats, delta, mu):
+    """
+    Sigma_delta = (1 - delta) Sigma_hat + delta mu I.
+    """
+    shrunk = (1 - delta) * stats.covariance().astype(np.float64)
+    shrunk[np.diag_indices_from(shrunk)] += delta * mu
+    return shrunk
+
+
+class WoodburyPrecision:
+    """
+    Omega_delta = a^-1 (I - Y^T (a I_n + Y Y^T)^-1 Y), stored as a, Y (n, p)
+    and the Cholesky factor of the n x n matrix: O(n p) memory.
+    """
+
+    def __init__(self, a, Y):
+        self.a = a
+        self.Y = Y
+        inner = Y @ Y.T
+        inner[np.diag_indices_from(inner)] += a
+        self.factor = linalg.cho_factor(inner)
+        self.shape = (Y.shape[1], Y.shape[1])
+
+    def __matmul__(self, v):
+        """
+        Omega_delta v for a vector or a (p, k) matrix, in O(n p k).
+        """
+        v = np.asarray(v, dtype=np.float64)
+        return (v - self.Y.T @ linalg.cho_solve(self.factor, self.Y @ v)) / self.a
+
+    def diagonal(self):
+        projected = linalg.cho_solve(self.factor, self.Y)
+        return (1 - np.einsum("ij,ij->j", self.Y, projected)) / self.a
+
+    def toarray(self):
+        """
+        Dense p x p Omega_delta.
+        """
+        return self @ np.eye(self.shape[0])
+
+
+def shrunk_precision(stats, delta, mu):
+    """
+    Omega_delta = Sigma_delta^-1.
+
+    While `stats` keeps its centred rows (n < p), Sigma_delta = a I + Y^T Y
+    with a = delta mu and Y = ((1 - delta) / n)^1/2 (X - mu_hat), and the
+    result is a WoodburyPrecision: only the n x n matrix is factored.
+    Otherwise Sigma_delta is factored by Cholesky and Omega_delta is dense.
+    """
+    a = delta * mu
+    if stats.rows is None or a <= 0:
+        p = len(stats.mean)
+        return linalg.cho_solve(linalg.cho_factor(shrunk_covariance(stats, delta, mu)), np.eye(p))
+    return WoodburyPrecision(a, stats.rows.astype(np.float64) * np.sqrt((1 - delta) / stats.n))
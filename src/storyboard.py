@@ -0,0 +1,167 @@
+"""
+Storyboard preview: one still per animation instead of a video.
+
+    python src/storyboard.py src/intro.py src/algo.py:LassoNeighborhood
+    python src/storyboard.py --by section --width 640 src/*.py
+
+Scenes run with manim's animation skipping on, so each `self.play` /
+`self.wait` jumps straight to its final state: no interpolation frames, no
+encoding. Only that final state is rasterised, at thumbnail size, and the
+stills are laid out as a captioned grid in media/storyboards/<Scene>.png.
+With `--by section`, only the last still of each section comment
+("### Lasso Halo ###") is kept. Scenes are rendered in parallel.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+from profiling import outermost, section_label
+
+
+STORYBOARD_DIR = Path("media") / "storyboards"
+CAPTION_HEIGHT = 18
+
+_frames = None
+_installed = False
+
+
+def install():
+    """
+    Patch manim, once per process, so that play/wait grab the frame they
+    end on.
+    """
+    global _installed
+    from manim import Scene
+
+    if _installed:
+        return
+    _installed = True
+
+    def grabbed(kind, scene, call, location, args):
+        result = call()
+        if _frames is not None:
+            filename, lineno = location
+            # Animations sautées : un seul rendu, sur l'état final
+            scene.renderer.update_frame(scene, ignore_skipping=True)
+            _frames.append({
+                "kind": kind,
+                "line": lineno,
+                "section": section_label(filename, lineno),
+                "frame": scene.renderer.get_frame(),
+            })
+        return result
+
+    wrap = outermost(grabbed)
+    Scene.play = wrap("play", Scene.play)
+    Scene.wait = wrap("wait", Scene.wait)
+
+
+def load_scenes(path):
+    """
+    Scene classes defined in a scene file, by name.
+    """
+    from manim import Scene
+
+    path = Path(path).resolve()
+    # Les scènes importent leurs voisins de src/ comme le fait manim
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {
+        name: cls for name, cls in vars(module).items()
+        if isinstance(cls, type) and issubclass(cls, Scene) and cls.__module__ == module.__name__
+    }
+
+
+def contact_sheet(stills, columns=4):
+    """
+    Grid of captioned stills.
+    """
+    height, width = stills[0]["frame"].shape[:2]
+    rows = -(-len(stills) // columns)
+    sheet = Image.new("RGB", (columns * width, rows * (height + CAPTION_HEIGHT)), "black")
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default()
+    for k, still in enumerate(stills):
+        x, y = (k % columns) * width, (k // columns) * (height + CAPTION_HEIGHT)
+        sheet.paste(Image.fromarray(still["frame"]).convert("RGB"), (x, y + CAPTION_HEIGHT))
+        caption = f"{k} {still['kind']} L{still['line']}  {still['section']}"
+        draw.text((x + 4, y + 3), caption, fill="white", font=font)
+    return sheet
+
+
+def storyboard(path, scene_name, by="play", width=480, columns=4, out=STORYBOARD_DIR):
+    """
+    Render one scene in skip mode and write its storyboard. Returns
+    (scene name, number of stills, seconds).
+    """
+    global _frames
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    install()
+    scene_class = load_scenes(path)[scene_name]
+    settings = {
+        "skip_animations": True,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+        "pixel_width": width,
+        "pixel_height": width * 9 // 16,
+        "verbosity": "WARNING",
+        "progress_bar": "none",
+    }
+    _frames = []
+    try:
+        with tempconfig(settings):
+            scene_class().render()
+        stills = _frames
+    finally:
+        _frames = None
+
+    if by == "section":
+        # Dernière image de chaque section
+        stills = [s for s, after in zip(stills, stills[1:] + [None])
+                  if after is None or after["section"] != s["section"]]
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    if stills:
+        contact_sheet(stills, columns).save(out / f"{scene_name}.png")
+    return scene_name, len(stills), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("scenes", nargs="+",
+                        help="scene file, or file.py:Scene to pick one scene of the file")
+    parser.add_argument("--by", choices=["play", "section"], default="play",
+                        help="one still per play/wait call, or per section comment")
+    parser.add_argument("--width", type=int, default=480, help="still width in pixels")
+    parser.add_argument("--columns", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=str(STORYBOARD_DIR))
+    args = parser.parse_args(argv)
+
+    tasks = []
+    for spec in args.scenes:
+        path, _, name = spec.partition(":")
+        tasks += [(path, scene) for scene in ([name] if name else load_scenes(path))]
+
+    options = {"by": args.by, "width": args.width, "columns": args.columns, "out": args.out}
+    with ProcessPoolExecutor(min(args.jobs, len(tasks))) as pool:
+        futures = [pool.submit(storyboard, path, scene, **options) for path, scene in tasks]
+        for future in as_completed(futures):
+            scene, count, elapsed = future.result()
+            print(f"{scene:<20} {count:>3} images {elapsed:6.1f}s -> {Path(args.out) / scene}.png")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
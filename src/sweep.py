@@ -0,0 +1,145 @@
+"""
+Continuous lambda sweep over the neighborhood selection path.
+"""
+
+from itertools import combinations
+
+import numpy as np
+from manim import *
+
+from heatmap import MatrixHeatmap
+from layout import cached_layout
+from neighborhood import (
+    NEIGHBORHOOD_EDGES,
+    empirical_covariance,
+    lambda_grid,
+    neighborhood_path,
+    precision_from_edges,
+    sample_gaussian,
+)
+
+
+# Graphe final de LassoNeighborhood
+NODES = 8
+
+
+class LassoPathSweep:
+    """
+    Neighborhood selection path precomputed once on a fixed lambda grid.
+
+    Frames index the grid with a continuous position t in [0, len(lambdas)-1]
+    and get linearly interpolated coefficients. Edge states are not
+    interpolated: an edge is on when it is selected at the grid point
+    nearest to t, so it never shows up a full grid step early.
+    """
+
+    def __init__(self, S, num=40, ratio=0.05):
+        self.lambdas = lambda_grid(S, num=num, ratio=ratio)
+        self.path = np.abs(neighborhood_path(S, self.lambdas))
+        self.pairs = list(combinations(range(S.shape[0]), 2))
+        rows, cols = np.array(self.pairs).T
+        # Poids d'arête E^and : min(|theta^i_j|, |theta^j_i|)
+        self.edge_weights = np.minimum(self.path[:, rows, cols], self.path[:, cols, rows])
+
+    def _bracket(self, t):
+        t = np.clip(t, 0, len(self.lambdas) - 1)
+        k = min(int(t), len(self.lambdas) - 2)
+        return k, t - k
+
+    def lam(self, t):
+        k, w = self._bracket(t)
+        return np.exp((1 - w) * np.log(self.lambdas[k]) + w * np.log(self.lambdas[k + 1]))
+
+    def coef(self, t):
+        k, w = self._bracket(t)
+        return (1 - w) * self.path[k] + w * self.path[k + 1]
+
+    def active(self, t):
+        # Point de grille le plus proche : interpoler les poids allumerait
+        # l'arête dès qu'elle est sélectionnée en k + 1
+        k, w = self._bracket(t)
+        return self.edge_weights[k + int(w >= 0.5)] > 0
+
+
+class LassoSweep(Scene):
+    """
+    Edges and precision matrix non-zeros appearing as lambda shrinks.
+    """
+
+    def construct(self):
+        """
+        Scene construction in sequence.
+        """
+
+        ########################################################################
+        ### Chemin de régularisation précalculé ################################
+        ########################################################################
+
+        omega = precision_from_edges(NODES, NEIGHBORHOOD_EDGES)
+        S = empirical_covariance(sample_gaussian(omega, n=200))
+        sweep = LassoPathSweep(S)
+        last = len(sweep.lambdas) - 1
+
+        ########################################################################
+        ### Pénalité et graphe #################################################
+        ########################################################################
+
+        penalty = MathTex(
+            r"\text{Pénalité Lasso: } \lambda \sum_{b=1}^{p} \lvert \theta_b^a \rvert",
+            font_size=DEFAULT_FONT_SIZE,
+            color=WHITE
+        ).to_edge(UP)
+
+        tracker = ValueTracker(0)
+        lam_value = DecimalNumber(
+            sweep.lam(0),
+            num_decimal_places=3,
+            font_size=DEFAULT_FONT_SIZE*0.8,
+            color=BLUE
+        )
+        lam_label = VGroup(
+            MathTex(r"\lambda =", font_size=DEFAULT_FONT_SIZE*0.8, color=BLUE),
+            lam_value
+        ).arrange(RIGHT).next_to(penalty, DOWN)
+        lam_value.add_updater(lambda m: m.set_value(sweep.lam(tracker.get_value())))
+
+        graph = Graph(
+            vertices=list(range(NODES)),
+            edges=sweep.pairs,
+            # Même disposition (et même cache) que LassoNeighborhood
+            layout=cached_layout(range(NODES), NEIGHBORHOOD_EDGES),
+            labels=True,
+            label_fill_color=BLUE,
+        ).to_edge(LEFT, buff=DEFAULT_MOBJECT_TO_EDGE_BUFFER*4)
+        for edge in graph.edges.values():
+            edge.set_stroke(opacity=0)
+
+        heatmap = MatrixHeatmap(sweep.coef(0), height=3.5).to_edge(RIGHT, buff=1.5)
+        heatmap_label = MathTex(r"\lvert \hat\theta^{a,\lambda}_b \rvert", color=ORANGE)
+        heatmap_label.next_to(heatmap, UP)
+
+        self.play(FadeIn(penalty), FadeIn(lam_label))
+        self.play(Create(graph), FadeIn(heatmap), FadeIn(heatmap_label))
+        self.wait(1)
+
+        ########################################################################
+        ### Balayage de lambda #################################################
+        ########################################################################
+
+        # Seules les arêtes qui changent d'état sont touchées à chaque frame
+        shown = np.zeros(len(sweep.pairs), dtype=bool)
+
+        def update_edges(mob):
+            state = sweep.active(tracker.get_value())
+            changed = np.flatnonzero(state != shown)
+            for k in changed:
+                mob.edges[sweep.pairs[k]].set_stroke(opacity=float(state[k]))
+            shown[changed] = state[changed]
+
+        graph.add_updater(update_edges)
+        heatmap.add_updater(lambda m: m.set_matrix(sweep.coef(tracker.get_value())))
+
+        self.play(tracker.animate.set_value(last), run_time=10, rate_func=linear)
+        self.wait(2)
+        self.play(tracker.animate.set_value(last / 2), run_time=4)
+        self.wait(2)